@@ -1,4 +1,5 @@
 import logging
+import re
 from drf_yasg.utils import swagger_serializer_method
 
 from rest_framework import serializers
@@ -8,7 +9,7 @@ from django.utils.translation import gettext_lazy as _
 
 from apps.contents.models import BookObject
 from core.validators import ISBNValidator
-from utils.naver_api import NaverSearchAPI
+from utils.naver_api import NaverSearchAPI, SearchUnavailable
 from utils.logging_utils import BraceStyleAdapter
 
 log = BraceStyleAdapter(logging.getLogger("api.contents.book_object.serializers"))
@@ -50,7 +51,16 @@ class BookCreateSerializer(serializers.ModelSerializer):
         try:
             book = BookObject.objects.get(isbn__exact=isbn)
         except BookObject.DoesNotExist:
-            _, value = NaverSearchAPI()(isbn)
+            search_type, value, degraded = NaverSearchAPI(priority='background').search_with_status(isbn)
+            if degraded:
+                # 장애 시 결과(만료된 cache, 등록 도서 검색)에는 다른 도서가 포함될 수 있으므로 isbn이 일치하는 결과만 사용
+                normalized = re.sub(" |-", "", isbn).upper()
+                value = [item for item in value or [] if item['isbn'] == normalized]
+            if not value:
+                # 네이버 API 장애로 도서 정보를 확인할 수 없는 경우 503
+                if degraded:
+                    raise SearchUnavailable()
+                raise ValidationError(detail=_("invalid_isbn"))
             book = BookObject.objects.create(**value[0])
         return book
 
@@ -7,10 +7,10 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 
 from django.db.models import Q
-from rest_framework.throttling import AnonRateThrottle
 
 from api.contents.book_object.serializers import BookCreateSerializer, BookObjectSerializer, DetailBookListSerializer
 from apps.contents.models import BookObject, Note, Page
+from core.throttling import AnonRateThrottle
 from utils.naver_api import NaverSearchAPI
 from utils.swagger import swagger_response, swagger_schema_with_properties, swagger_schema_with_description, \
     BookObjectFailCaseCollection as book_fail_case, swagger_parameter
@@ -71,7 +71,7 @@ class BookView(generics.CreateAPIView):
 
 
 class TaggingBookSearchAPIView(generics.RetrieveAPIView):
-    search_class = NaverSearchAPI()
+    search_class = NaverSearchAPI(concurrent_fallback=True)
     serializer_class = DetailBookListSerializer
     queryset = BookObject.objects.all()
     authentication_classes = []
@@ -117,10 +117,17 @@ class TaggingBookSearchAPIView(generics.RetrieveAPIView):
     )
     def get(self, request, *args, **kwargs):
         q, display = self.get_params(request)
-        result = self.search_class(q, display)
+        result = self.search_class.search_with_status(q, display)
         if result is None:
             return Response(None, status=status.HTTP_204_NO_CONTENT)
-        return Response(result, status=status.HTTP_200_OK)
+
+        search_type, items, degraded = result
+        return Response((search_type, items), status=status.HTTP_200_OK, headers=self.get_degraded_headers(degraded))
+
+    @staticmethod
+    def get_degraded_headers(degraded):
+        # 네이버 API 장애로 cache/등록 도서 결과를 사용한 경우 header로 표시
+        return {'X-Search-Degraded': 'true'} if degraded else None
 
 
 class NavbarBookSearchAPIView(TaggingBookSearchAPIView):
@@ -147,7 +154,7 @@ class NavbarBookSearchAPIView(TaggingBookSearchAPIView):
             Q(publisher__contains=q) |
             Q(isbn__exact=q)
         )
-        api_search_type, api_search_result = self.search_class(q, display)
+        api_search_type, api_search_result, degraded = self.search_class.search_with_status(q, display)
         results = self.serializer_class(instance=db_search_result, many=True).data
         db_search_isbn_keys = [re['isbn'] for re in results]
         for api_re in api_search_result:
@@ -161,4 +168,4 @@ class NavbarBookSearchAPIView(TaggingBookSearchAPIView):
             result.update({'count': p_count})
         results.sort(key=lambda x: x['count'], reverse=True)
         response = {"type": api_search_type, "results": results}
-        return Response(response, status=status.HTTP_200_OK)
+        return Response(response, status=status.HTTP_200_OK, headers=self.get_degraded_headers(degraded))
@@ -1,4 +1,5 @@
 import logging
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
@@ -52,7 +53,7 @@ class NoteSerializer(serializers.ModelSerializer):
 
     @staticmethod
     def get_note_pages(instance: Note):
-        pages = Page.objects.filter(note_id=instance.id)
+        pages = Page.objects.with_likes().filter(note_id=instance.id)
         return pages
 
     def to_representation(self, instance: Note):
@@ -60,10 +61,10 @@ class NoteSerializer(serializers.ModelSerializer):
             'id': instance.id,
             'note_author': UserSerializer(instance=instance.user).data,
             'book': BookObjectSerializer(instance=instance.book).data,
-            'like_count': instance.note_likes_relation.count(),
+            'like_count': instance.like_count,
             'like_user': self.get_like_user(instance),
             'hit': instance.hit,
-            'pages_count': self.get_note_pages(instance).count()
+            'pages_count': instance.page_count
         }
 
 
@@ -102,5 +103,7 @@ class NoteLikesRelationSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def create(self, validated_data):
-        note_relation = NoteLikesRelation.objects.create(**validated_data)
+        with transaction.atomic():
+            note_relation = NoteLikesRelation.objects.create(**validated_data)
+            note_relation.note.update_like_count(1)
         return note_relation.note, note_relation
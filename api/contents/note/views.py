@@ -3,6 +3,7 @@ import logging
 
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema, no_body
+from django.db import transaction
 
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation.trans_null import gettext_lazy
@@ -47,7 +48,6 @@ class NoteView(generics.GenericAPIView, mixins.RetrieveModelMixin, mixins.Create
 
         if request.user and request.user.id != note.user.id:
             note.update_note_hit()
-            note.save()
 
         note_data = self.serializer_class(instance=note).data
 
@@ -176,5 +176,7 @@ class NoteLikeView(generics.GenericAPIView, mixins.CreateModelMixin, mixins.Dest
         except NoteLikesRelation.DoesNotExist:
             raise ValidationError(detail=_('no_exist_like'))
 
-        self.perform_destroy(relation)
+        with transaction.atomic():
+            self.perform_destroy(relation)
+            note.update_like_count(-1)
         return Response(None, status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -9,8 +9,10 @@ from api.contents.book_object.serializers import BookObjectSerializer, DetailBoo
 from api.contents.note.serializers import NoteWithoutBookSchemaSerializer
 from api.contents.page_comment.serializers import PageCommentSerializer
 from api.users.serializers import UserSerializer
-from apps.contents.models import Page, PageLikesRelation, Note
+from apps.contents.models import Page, PageLikesRelation, Note, PAGE_COMMENT_PREVIEW_SIZE, prefetch_comment_previews
+from core.pagination import PageCommentCursorPagination
 from core.serializers import StringListField
+from utils.cache import prepend_main_feed
 from utils.logging_utils import BraceStyleAdapter
 
 log = BraceStyleAdapter(logging.getLogger("api.contents.page.views"))
@@ -32,6 +34,9 @@ class PageSchemaSerializer(serializers.Serializer):
     note = NoteWithoutBookSchemaSerializer(help_text='페이지가 등록된 노트', read_only=True)
     book = BookObjectSerializer(help_text='도서 정보', read_only=True)
     page_detail = PageDetailSchemaSerialzer(help_text='페이지 세부정보', read_only=True)
+    page_comments_cursor = serializers.CharField(
+        help_text='댓글 목록 api의 다음 cursor (이후 댓글이 없는 경우 null)', read_only=True
+    )
 
 
 class PageAllSchemaSerializer(serializers.Serializer):
@@ -61,6 +66,9 @@ class PageBulkSerializer(serializers.ListSerializer):
                 p.note_index = note_index['count'] + 1
                 note_index['count'] += 1
             Page.objects.bulk_update(pages, ['note_index'])
+            self.note.update_page_count(len(pages))
+            page_ids = [p.id for p in pages]
+            transaction.on_commit(lambda: prepend_main_feed(page_ids))
             return pages
 
     def update(self, instance, validated_data):
@@ -83,6 +91,7 @@ class PageSerializer(serializers.ModelSerializer):
 
     @staticmethod
     def get_like_user(instance):
+        # Page.objects.with_likes()로 prefetch된 relation을 사용 (like_user는 select_related)
         like_user = []
         relation = instance.page_likes_relation.all()
         for r in relation:
@@ -97,12 +106,21 @@ class PageSerializer(serializers.ModelSerializer):
             'phrase': instance.phrase,
             'book_page': instance.book_page,
             'hit': instance.hit,
-            'like_count': instance.page_likes_relation.count(),
+            'like_count': instance.like_count,
             'like_user': self.get_like_user(instance)
         }
 
 
+class PageDetailListSerializer(PageBulkSerializer):
+    def to_representation(self, data):
+        # 페이지 목록의 댓글을 한 번에 prefetch
+        return super(PageDetailListSerializer, self).to_representation(prefetch_comment_previews(data))
+
+
 class PageDetailSerializer(PageSerializer):
+    class Meta(PageSerializer.Meta):
+        list_serializer_class = PageDetailListSerializer
+
     @staticmethod
     def get_note_author_from_book(instance: Page):
         return UserSerializer(instance=instance.note.user).data
@@ -113,19 +131,34 @@ class PageDetailSerializer(PageSerializer):
 
     @staticmethod
     def get_comments_from_page(instance: Page):
-        return PageCommentSerializer(instance=instance.page_comment.all(), many=True).data
+        """
+        prefetch_comment_previews()로 path 순으로 prefetch된 댓글 중 앞의 PAGE_COMMENT_PREVIEW_SIZE개 thread와,
+        이후 댓글을 댓글 목록 api로 조회하기 위한 cursor를 return 합니다.
+        """
+        prefetch_comment_previews([instance])
+        comments = list(instance.page_comment.all())
+        roots = sorted([c for c in comments if c.parent_id is None], key=lambda c: (c.created_at, c.id))
+        if len(roots) <= PAGE_COMMENT_PREVIEW_SIZE:
+            return PageCommentSerializer.build_thread(comments), None
+
+        roots = roots[:PAGE_COMMENT_PREVIEW_SIZE]
+        root_ids = {root.id for root in roots}
+        comments = [comment for comment in comments if comment.root_id in root_ids]
+        cursor = PageCommentCursorPagination().encode_cursor(roots[-1], reverse=False)
+        return PageCommentSerializer.build_thread(comments), cursor
 
     def to_representation(self, instance: Page):
         page_author = self.get_note_author_from_book(instance)
         book = self.get_book_from_page(instance)
-        page_comments = self.get_comments_from_page(instance)
+        page_comments, page_comments_cursor = self.get_comments_from_page(instance)
         page_detail = super(PageDetailSerializer, self).to_representation(instance)
 
         return OrderedDict([
             ('book', book),
             ('page_author', page_author),
             ('page_detail', page_detail),
-            ('page_comments', page_comments)
+            ('page_comments', page_comments),
+            ('page_comments_cursor', page_comments_cursor)
         ])
 
 
@@ -135,5 +168,7 @@ class PageLikesRelationSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def create(self, validated_data):
-        page_relation = PageLikesRelation.objects.create(**validated_data)
+        with transaction.atomic():
+            page_relation = PageLikesRelation.objects.create(**validated_data)
+            page_relation.page.update_like_count(1)
         return page_relation.page, page_relation
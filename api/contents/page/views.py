@@ -45,7 +45,7 @@ class PageView(generics.GenericAPIView,
                mixins.CreateModelMixin,
                mixins.UpdateModelMixin,
                mixins.DestroyModelMixin):
-    queryset = Page.objects.all().select_related('note__user', 'note__book').prefetch_related('page_comment')
+    queryset = Page.objects.with_detail()
     serializer_class = PageDetailSerializer
 
     @swagger_auto_schema(
@@ -68,7 +68,6 @@ class PageView(generics.GenericAPIView,
 
         if request.user and request.user.id != page.note.user.id:
             page.update_page_hit()
-            page.save()
 
         response = self.serializer_class(instance=page).data
         return Response(response, status.HTTP_200_OK)
@@ -187,7 +186,9 @@ class PageView(generics.GenericAPIView,
         if request.user and request.user.id != page.note.user.id:
             raise AuthenticationFailed(detail=_("unauthorized_user"))
 
-        self.perform_destroy(page)
+        with transaction.atomic():
+            self.perform_destroy(page)
+            page.note.update_page_count(-1)
         return Response(None, status=status.HTTP_204_NO_CONTENT)
 
 
@@ -252,13 +253,15 @@ class PageLikeView(generics.GenericAPIView, mixins.CreateModelMixin, mixins.Dest
         except PageLikesRelation.DoesNotExist:
             raise ValidationError(detail=_('no_exist_like'))
 
-        self.perform_destroy(relation)
+        with transaction.atomic():
+            self.perform_destroy(relation)
+            page.update_like_count(-1)
         return Response(None, status=status.HTTP_204_NO_CONTENT)
 
 
 # TASK 5: 하나의 도서에 대한 모든 페이지 list를 반환하는 api
 class PageAllView(generics.GenericAPIView):
-    queryset = Page.objects.all().select_related('note__book')
+    queryset = Page.objects.with_likes()
     serializer_class = PageSerializer
     lookup_field = 'isbn'
 
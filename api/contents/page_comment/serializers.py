@@ -1,10 +1,11 @@
 import logging
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
-from apps.contents.models import Page, PageComment
+from apps.contents.models import Page, PageComment, PAGE_COMMENT_MAX_DEPTH
 from api.users.serializers import UserSerializer
 from core.exceptions import PageNotFound, PageCommentNotFound
 from utils.logging_utils import BraceStyleAdapter
@@ -21,18 +22,19 @@ class PageCommentSchemaSerializer(serializers.Serializer):
     content = serializers.CharField(help_text='코멘트 내용', read_only=True)
 
 
+class PageCommentListSchemaSerializer(serializers.Serializer):
+    previous_cursor = serializers.CharField(help_text='이전 페이지 cursor', read_only=True)
+    next_cursor = serializers.CharField(help_text='다음 페이지 cursor', read_only=True)
+    page_comments = PageCommentSchemaSerializer(many=True, help_text='최상위 댓글과 하위 댓글 (thread 순)', read_only=True)
+
+
 class PageCommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = PageComment
         fields = '__all__'
 
-    def to_representation(self, instance: PageComment):
-        parent = instance.parent
-        if parent == 0:
-            rep_parent = parent
-        else:
-            parent_comment_instance = PageComment.objects.get(id=instance.parent)
-            rep_parent = PageCommentSerializer(instance=parent_comment_instance).data
+    @staticmethod
+    def get_comment_data(instance: PageComment, parent_data):
         return {
             'id': instance.id,
             'comment_user': {
@@ -40,11 +42,31 @@ class PageCommentSerializer(serializers.ModelSerializer):
                 'nickname': instance.comment_user.nickname
             },
             'depth': instance.depth,
-            'parent': rep_parent,
+            'parent': parent_data,
             'content': instance.content,
-            'page_id': instance.page.id
+            'page_id': instance.page_id
         }
 
+    @classmethod
+    def build_thread(cls, comments):
+        """
+        path 순으로 정렬된 댓글 목록을 추가 query 없이 직렬화합니다.
+        부모 댓글이 항상 먼저 나오므로, 부모의 직렬화 결과를 그대로 자식 댓글의 parent로 사용합니다.
+        """
+        comments_data = {}
+        for comment in comments:
+            comments_data[comment.id] = cls.get_comment_data(comment, comments_data.get(comment.parent_id, 0))
+        return [comments_data[comment.id] for comment in comments]
+
+    def to_representation(self, instance: PageComment):
+        if instance.parent_id is None:
+            return self.get_comment_data(instance, 0)
+
+        # 상위 댓글은 path에 포함된 id로 한 번에 조회
+        ancestors = PageComment.objects.filter(id__in=instance.get_ancestor_ids())\
+            .select_related('comment_user').order_by('path')
+        return self.build_thread([*ancestors, instance])[-1]
+
 
 class PageCommentCreateUpdateSerializer(serializers.ModelSerializer):
     comment_user = UserSerializer()
@@ -67,17 +89,19 @@ class PageCommentCreateUpdateSerializer(serializers.ModelSerializer):
         return self.page
 
     def get_parent(self, value):
-        if value == 0:
-            self.parent, self.depth = 0, 0
+        if not value:
+            self.parent, self.depth = None, 0
         else:
             try:
                 parent_comment = PageComment.objects.get(id=value)
             except PageComment.DoesNotExist:
                 raise PageCommentNotFound(detail=_("no_exist_parent_comment"))
             else:
-                if parent_comment.page.id != self.page.id:
+                if parent_comment.page_id != self.page.id:
                     raise ValidationError(detail=_("invalid_parent_comment_pk"))
-                self.parent, self.depth = parent_comment.id, parent_comment.depth + 1
+                if parent_comment.depth >= PAGE_COMMENT_MAX_DEPTH:
+                    raise ValidationError(detail=_("max_comment_depth_exceeded"))
+                self.parent, self.depth = parent_comment, parent_comment.depth + 1
 
         return self.parent
 
@@ -97,7 +121,9 @@ class PageCommentCreateUpdateSerializer(serializers.ModelSerializer):
             "content": validated_data.pop('content')
         }
 
-        page_comment = PageComment.objects.create(**data)
+        with transaction.atomic():
+            page_comment = PageComment.objects.create(**data)
+            self.page.update_comment_count(1)
         return page_comment
 
     def update(self, instance, validated_data):
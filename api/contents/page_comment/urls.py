@@ -9,4 +9,5 @@ urlpatterns = [
     path('<int:pk>', PageCommentView.as_view(http_method_names=['get']), name='page_comment_detail'),
     path('<int:pk>/edit', PageCommentView.as_view(http_method_names=['patch']), name='page_comment_edit'),
     path('<int:pk>/delete', PageCommentView.as_view(http_method_names=['delete']), name='page_comment_delete'),
+    path('pages/<int:pk>', PageCommentListView.as_view(), name='page_comment_list'),
 ]
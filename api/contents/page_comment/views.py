@@ -4,6 +4,7 @@ import logging
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import generics, mixins, status
@@ -11,11 +12,13 @@ from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.response import Response
 
 from api.contents.page_comment.serializers import *
-from apps.contents.models import PageComment
-from core.exceptions import PageCommentNotFound
+from apps.contents.models import Page, PageComment
+from core.exceptions import PageCommentNotFound, PageNotFound
+from core.pagination import PageCommentCursorPagination
 from utils.swagger import swagger_response, swagger_schema_with_description, swagger_schema_with_properties, \
-    PageCommentFailCaseCollection as page_comment_fail_case, UserFailCaseCollection as user_fail_case, \
-    page_comment_response_example
+    swagger_parameter, PageCommentFailCaseCollection as page_comment_fail_case, \
+    UserFailCaseCollection as user_fail_case, PageFailCaseCollection as page_fail_case, \
+    page_comment_response_example, page_comment_list_response_example
 from utils.logging_utils import BraceStyleAdapter
 
 log = BraceStyleAdapter(logging.getLogger("api.contents.page_comment.views"))
@@ -151,5 +154,49 @@ class PageCommentView(generics.GenericAPIView,
         page_comment = self.get_page_comment_object()
         self.authentication(page_comment)
 
-        self.perform_destroy(page_comment)
+        with transaction.atomic():
+            # 하위 댓글도 함께 삭제되므로 삭제되는 댓글 수만큼 감소
+            deleted_count = page_comment.get_descendants().count() + 1
+            self.perform_destroy(page_comment)
+            page_comment.page.update_comment_count(-deleted_count)
         return Response(None, status=status.HTTP_204_NO_CONTENT)
+
+
+class PageCommentListView(generics.ListAPIView):
+    queryset = PageComment.objects.filter(parent__isnull=True).select_related('comment_user')
+    serializer_class = PageCommentSerializer
+    pagination_class = PageCommentCursorPagination
+    # (page_id, created_at, id) index 사용
+    ordering = ('created_at', 'id')
+
+    @swagger_auto_schema(
+        operation_id='page_comment_list',
+        operation_description='페이지의 댓글을 최상위 댓글 기준 cursor pagination으로 조회합니다.\n'
+                              '각 최상위 댓글의 하위 댓글은 함께 return 됩니다.',
+        manual_parameters=[
+            swagger_parameter('pk', openapi.IN_PATH, '페이지 id', openapi.TYPE_INTEGER),
+            swagger_parameter('cursor', openapi.IN_QUERY,
+                              'next_cursor/previous_cursor 또는 페이지 상세 조회의 page_comments_cursor (첫 페이지는 생략)',
+                              openapi.TYPE_STRING),
+            swagger_parameter('limit', openapi.IN_QUERY, '한 번에 조회할 최상위 댓글 수 (default=10, max=100)',
+                              openapi.TYPE_INTEGER),
+        ],
+        responses={
+            200: swagger_response(
+                description='PAGE_COMMENT_200_LIST',
+                schema=PageCommentListSchemaSerializer,
+                examples=page_comment_list_response_example
+            ),
+            404: page_fail_case.PAGE_404_DOES_NOT_EXIST.as_md()
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        if not Page.objects.filter(id=self.kwargs[self.lookup_field]).exists():
+            raise PageNotFound()
+
+        roots = self.paginate_queryset(self.get_queryset().filter(page_id=self.kwargs[self.lookup_field]))
+        replies = PageComment.objects.filter(root_id__in=[root.id for root in roots], parent__isnull=False)\
+            .select_related('comment_user')
+        comments = sorted([*roots, *replies], key=lambda comment: comment.path)
+
+        return self.get_paginated_response(self.serializer_class.build_thread(comments))
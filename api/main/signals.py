@@ -0,0 +1,44 @@
+from django.db import transaction
+
+from apps.contents.models import Page
+from utils.cache import invalidate_main_feed, delete_page_fragments, prepend_main_feed
+
+
+def invalidate_page_fragment(sender, instance, **kwargs):
+    # 좋아요/댓글 등록, 수정, 삭제 시 해당 page의 fragment 삭제
+    # 좋아요/댓글 수는 Page.update_*_count()에서 update 이후 다시 삭제
+    page_id = instance.page_id
+    transaction.on_commit(lambda: delete_page_fragments([page_id]))
+
+
+def save_page(sender, instance: Page, created=False, **kwargs):
+    page_id = instance.id
+    transaction.on_commit(lambda: delete_page_fragments([page_id]))
+    if created:
+        # bulk_create로 등록된 page는 PageBulkSerializer에서 snapshot 앞에 추가
+        transaction.on_commit(lambda: prepend_main_feed([page_id]))
+
+
+def delete_page(sender, instance: Page, **kwargs):
+    delete_page_fragments([instance.id])
+    invalidate_main_feed()
+
+
+def invalidate_author_fragments(sender, instance, created=False, update_fields=None, **kwargs):
+    # fragment에 포함된 작성자 정보 수정 시 작성한 page의 fragment 삭제 (로그인 시각 갱신은 제외)
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    user_id = instance.id
+    transaction.on_commit(
+        lambda: delete_page_fragments(list(Page.objects.filter(note__user_id=user_id).values_list('id', flat=True)))
+    )
+
+
+def invalidate_book_fragments(sender, instance, created=False, **kwargs):
+    # fragment에 포함된 도서 정보 수정 시 해당 도서 page의 fragment 삭제
+    if created:
+        return
+    book_id = instance.id
+    transaction.on_commit(
+        lambda: delete_page_fragments(list(Page.objects.filter(note__book_id=book_id).values_list('id', flat=True)))
+    )
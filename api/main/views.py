@@ -1,4 +1,3 @@
-import json
 import logging
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema, no_body
@@ -18,23 +17,74 @@ from api.users.serializers import UserSerializer
 from apps.contents.models import Note, Page, BookObject
 from apps.users.models import User
 from core.exceptions import UserNotFound
+from core.pagination import MainViewPagination, MainViewCursorPagination, UserMainViewPagination, \
+    NoteListPagination
 from core.views import TemplateMainView
+from utils.cache import MAIN_FEED_SIZE, get_main_feed_snapshot, set_main_feed_snapshot, get_page_fragments, \
+    set_page_fragments
 
 from utils.swagger import swagger_response, swagger_parameter, main_response_example, user_main_response_example, \
     UserFailCaseCollection as user_fail_case, main_note_list_response_example
 from utils.logging_utils import BraceStyleAdapter
+from utils.renderer import stream_success_response
 
 log = BraceStyleAdapter(logging.getLogger("api.main.views"))
 
 
 class MainView(TemplateMainView):
-    queryset = Page.objects.all().select_related('note', 'note__book')
+    queryset = Page.objects.with_detail()
     serializer_class = PageDetailSerializer
+    cursor_pagination_class = MainViewCursorPagination
+    data_key = 'pages'
     authentication_classes = []
-
-    def __init__(self):
-        super(MainView, self).__init__()
-        self.pagination_class.data_key = 'pages'
+    ordering = ('-created_at', '-id')
+    # 기본 정렬(최신순)은 redis snapshot(page id list) + page 별 fragment cache로 응답
+    feed_ordering = ('-created_at', '-id')
+    # mode 별 정렬 key (page 테이블의 (key, id) index 사용)
+    sort_keys = {
+        'hit': 'hit',
+        'likes': 'like_count',
+        'reviews': 'comment_count'
+    }
+
+    def get_ordering(self):
+        key = self.sort_keys.get(self.request.query_params.get('mode'), 'created_at')
+        if self.request.query_params.get('sorting') == 'ascending':
+            return key, 'id'
+        return '-' + key, '-id'
+
+    def get_feed_data(self, page_ids):
+        fragments = get_page_fragments(page_ids)
+        missing = [page_id for page_id in page_ids if page_id not in fragments]
+        if missing:
+            pages = list(self.get_queryset().filter(id__in=missing))
+            data = self.serializer_class(instance=pages, many=True).data
+            new_fragments = {page.id: page_data for page, page_data in zip(pages, data)}
+            set_page_fragments(new_fragments)
+            fragments.update(new_fragments)
+
+        # snapshot 생성 이후 삭제된 page는 제외
+        return [fragments[page_id] for page_id in page_ids if page_id in fragments]
+
+    def get_feed_response(self):
+        paginator = self.paginator
+        paginator.request = self.request
+        paginator.limit = paginator.get_limit(self.request)
+        paginator.offset = paginator.get_offset(self.request)
+
+        snapshot = get_main_feed_snapshot(paginator.offset, paginator.limit)
+        if snapshot is None:
+            ids = list(self.get_queryset().order_by(*self.feed_ordering).values_list('id', flat=True)[:MAIN_FEED_SIZE])
+            count = len(ids) if len(ids) < MAIN_FEED_SIZE else self.get_queryset().count()
+            set_main_feed_snapshot(ids, count)
+            snapshot = ids[paginator.offset:paginator.offset + paginator.limit], len(ids), count
+
+        page_ids, size, paginator.count = snapshot
+        if paginator.offset + paginator.limit > size and size < paginator.count:
+            # snapshot 범위를 벗어난 조회는 DB에서 처리
+            return None
+
+        return paginator.get_paginated_response(self.get_feed_data(page_ids))
 
     @swagger_auto_schema(
         operation_id='main',
@@ -46,7 +96,10 @@ class MainView(TemplateMainView):
                               pattern=['ascending / descending']),
             swagger_parameter('limit', openapi.IN_QUERY, '한 번에 조회할 데이터의 수 (default=4, max=count)',
                               openapi.TYPE_INTEGER),
-            swagger_parameter('offset', openapi.IN_QUERY, '조회할 데이터의 offset (default=0)', openapi.TYPE_INTEGER)
+            swagger_parameter('offset', openapi.IN_QUERY, '조회할 데이터의 offset (default=0)', openapi.TYPE_INTEGER),
+            swagger_parameter('cursor', openapi.IN_QUERY,
+                              'cursor 기반 조회 (첫 페이지는 빈 값, 이후 next_cursor/previous_cursor 전달. count는 제공하지 않음)',
+                              openapi.TYPE_STRING)
         ],
         responses={
             200: swagger_response(
@@ -58,27 +111,35 @@ class MainView(TemplateMainView):
         security=[]
     )
     def get(self, request, *args, **kwargs):
-        data = self.get_paginated_data(self.get_queryset().order_by('-created_at'))
+        self.ordering = self.get_ordering()
+        if self.ordering == self.feed_ordering and isinstance(self.paginator, MainViewPagination):
+            response = self.get_feed_response()
+            if response is not None:
+                return response
+
+        data = self.get_paginated_data(self.get_queryset().order_by(*self.ordering))
         return self.get_paginated_response(data)
 
 
 class UserMainView(TemplateMainView):
-    queryset = Note.objects.all().exclude(page__isnull=True).select_related('user')
+    queryset = Note.objects.with_detail()
     serializer_class = NoteSerializer
-
-    def __init__(self):
-        super(UserMainView, self).__init__()
-
-    def filter_data(self, request, data):
-        key = self.request.query_params.get('key')
-        if key not in ['hit', 'like', 'pages']:
-            return data
-        if key in ['like', 'pages']:
-            key += '_count'
-
-        sorting = self.request.query_params.get('sorting')
-        data.sort(key=lambda x: x[key], reverse=True) if sorting == 'descending' else data.sort(key=lambda x: x[key])
-        return data
+    pagination_class = UserMainViewPagination
+    data_key = 'notes'
+    # key 별 정렬 기준 (note 테이블의 (user, key, id) index 사용)
+    sort_keys = {
+        'hit': 'hit',
+        'like': 'like_count',
+        'pages': 'page_count'
+    }
+
+    def get_ordering(self):
+        key = self.sort_keys.get(self.request.query_params.get('key'))
+        if key is None:
+            return 'created_at', 'id'
+        if self.request.query_params.get('sorting') == 'descending':
+            return '-' + key, '-id'
+        return key, 'id'
 
     @swagger_auto_schema(
         operation_id='user_main',
@@ -88,6 +149,9 @@ class UserMainView(TemplateMainView):
                               pattern=['hit, like, pages']),
             swagger_parameter('sorting', openapi.IN_QUERY, '오름차순/내림차순', openapi.TYPE_STRING,
                               pattern=['ascending, descending']),
+            swagger_parameter('limit', openapi.IN_QUERY, '한 번에 조회할 노트의 수 (default=10, max=100)',
+                              openapi.TYPE_INTEGER),
+            swagger_parameter('offset', openapi.IN_QUERY, '조회할 데이터의 offset (default=0)', openapi.TYPE_INTEGER),
         ],
         responses={
             200: swagger_response(
@@ -105,16 +169,11 @@ class UserMainView(TemplateMainView):
         except Exception:
             raise UserNotFound()
 
-        # TASK 1: 사용자가 작성한 전체 노트의 목록을 return
-        queryset = self.get_queryset().filter(user_id=user.id)
-        serializer = self.serializer_class(instance=queryset, many=True)
-        notes = self.filter_data(self.request, serializer.data)
+        # TASK 1: 사용자가 작성한 전체 노트의 목록을 return (정렬, pagination은 DB에서 처리)
+        queryset = self.get_queryset().filter(user_id=user.id, page_count__gt=0).order_by(*self.get_ordering())
+        notes = self.get_paginated_data(queryset)
 
-        response = {
-            "notes": notes,
-            "user": UserSerializer(instance=user).data
-        }
-        return Response(response, status=status.HTTP_200_OK)
+        return self.paginator.get_paginated_response(notes, user=UserSerializer(instance=user).data)
 
 
 class SearchView(generics.GenericAPIView, mixins.RetrieveModelMixin):
@@ -130,14 +189,21 @@ class SearchView(generics.GenericAPIView, mixins.RetrieveModelMixin):
 
 
 class NoteListView(generics.RetrieveAPIView):
-    queryset = Note.objects.all().select_related('book__isbn')
+    queryset = Note.objects.all()
     serializer_class = SimpleBookListSerializer
+    pagination_class = NoteListPagination
+    chunk_size = 500
 
     @swagger_auto_schema(
         operation_id='main_note_list',
         operation_description='사용자가 필사한 책 정보(isbn, 등록일)를 조회합니다.',
         request_body=no_body,
-        manual_parameters=[swagger_parameter('id', openapi.IN_PATH, '사용자 id', openapi.TYPE_INTEGER)],
+        manual_parameters=[
+            swagger_parameter('id', openapi.IN_PATH, '사용자 id', openapi.TYPE_INTEGER),
+            swagger_parameter('limit', openapi.IN_QUERY, '한 번에 조회할 데이터의 수 (limit, offset이 없는 경우 전체 조회)',
+                              openapi.TYPE_INTEGER),
+            swagger_parameter('offset', openapi.IN_QUERY, '조회할 데이터의 offset (default=0)', openapi.TYPE_INTEGER)
+        ],
         responses={
             200: swagger_response(
                 description='MAIN_NOTE_LIST_200',
@@ -155,7 +221,16 @@ class NoteListView(generics.RetrieveAPIView):
 
         queryset = self.get_queryset().filter(user=user)\
             .annotate(note_id=F('id'), isbn=F('book__isbn'), datetime=F('created_at'))\
-            .values('note_id', 'isbn', 'datetime').order_by('-datetime')
-        book_list = json.dumps(list(queryset), cls=DjangoJSONEncoder)
-
-        return Response(json.loads(book_list), status=status.HTTP_200_OK)
+            .values('note_id', 'isbn', 'datetime').order_by('-datetime', '-id')
+
+        params = self.request.query_params
+        if self.paginator.limit_query_param in params or self.paginator.offset_query_param in params:
+            encoder = DjangoJSONEncoder()
+            notes = [
+                dict(note, datetime=encoder.default(note['datetime']))
+                for note in self.paginate_queryset(queryset)
+            ]
+            return self.get_paginated_response(notes)
+
+        # 전체 조회는 결과를 list로 만들지 않고 chunk 단위로 streaming
+        return stream_success_response(queryset.iterator(chunk_size=self.chunk_size), chunk_size=self.chunk_size)
@@ -2,7 +2,7 @@ from django.urls import include, path
 from rest_framework.permissions import AllowAny
 from rest_framework.routers import DefaultRouter
 
-from core.views import ScribbleTokenRefreshView
+from core.views import MetricsView, ScribbleTokenRefreshView
 from api.users.views import UserViewSet
 
 from drf_yasg.views import get_schema_view
@@ -29,6 +29,7 @@ urlpatterns = [
     path('contents/', include('api.contents.urls')),
     path('main/', include('api.main.urls')),
     path('token/refresh', ScribbleTokenRefreshView.as_view(), name='token_refresh'),
+    path('metrics', MetricsView.as_view(), name='metrics'),
     path('swagger', schema_view.with_ui('swagger', cache_timeout = 0), name='schema-swagger-ui'),
     path('docs', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
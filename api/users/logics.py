@@ -1,13 +1,13 @@
 import os
 import json
 from typing import Tuple
-from urllib import request, parse
 from dotenv import load_dotenv
 
 from rest_framework.exceptions import ValidationError
 
 from api.users.serializers import UserSerializer
 from apps.users.models import User
+from utils.http import OutboundRequestError, http_client
 
 load_dotenv()
 
@@ -46,16 +46,15 @@ class SocialLoginService:
     def get_kakao_token(self, code, redirect_uri):
         url = self.kakao_auth_url(code=code, redirect_uri=redirect_uri)
 
-        req = request.Request(url=url)
-        req.add_header("Content-type", "application/x-www-form-urlencoded")
-
-        response = request.urlopen(req)
-        res_code = response.getcode()
-        if res_code != 200:
+        headers = {"Content-type": "application/x-www-form-urlencoded"}
+        try:
+            response = http_client.get(url, headers=headers)
+        except OutboundRequestError:
+            raise ValidationError("invalid_code")
+        if response.status != 200:
             raise ValidationError("invalid_code")
 
-        res_body = response.read().decode('utf-8')
-        res_data = json.loads(res_body)
+        res_data = json.loads(response.data.decode('utf-8'))
 
         access_token = res_data.get("access_token")
         return access_token
@@ -63,17 +62,18 @@ class SocialLoginService:
     def get_kakao_user(self, access_token):
         url = self.kakao_profile_url()
 
-        req = request.Request(url=url)
-        req.add_header("Authorization", f"Bearer {access_token}")
-        req.add_header("Content-type", "application/x-www-form-urlencoded; charset=utf-8")
-
-        response = request.urlopen(req)
-        res_code = response.getcode()
-        if res_code != 200:
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-type": "application/x-www-form-urlencoded; charset=utf-8"
+        }
+        try:
+            response = http_client.get(url, headers=headers)
+        except OutboundRequestError:
+            raise ValidationError("invalid_token")
+        if response.status != 200:
             raise ValidationError("invalid_token")
 
-        res_body = response.read().decode('utf-8')
-        res_data = json.loads(res_body)
+        res_data = json.loads(response.data.decode('utf-8'))
 
         return res_data
 
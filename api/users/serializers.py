@@ -8,12 +8,15 @@ from rest_framework.exceptions import ValidationError
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.serializers import TokenBlacklistSerializer
 
+from apps.users.availability import is_available
 from apps.users.choices import SocialAccountTypeEnum
 from apps.users.models import User, category_choices
 from core.fields import ChoiceTypeField
+from core.tokens import ScribbleRefreshToken
 from core.validators import SpecificEmailDomainValidator, domain_allowlist, CategoryDictValidator
 from scribble.authentication import CustomJWTAuthentication
 from utils.logging_utils import BraceStyleAdapter
+from utils.passwords import password_hashing_pool
 
 log = BraceStyleAdapter(logging.getLogger("api.users.serializers"))
 
@@ -67,6 +70,7 @@ class UserBaseSerializer(serializers.ModelSerializer):
 
 
 class SignOutSerializer(TokenBlacklistSerializer):
+    token_class = ScribbleRefreshToken
     user_id = serializers.IntegerField()
     access = serializers.CharField(read_only=True)
     refresh = serializers.CharField()
@@ -144,21 +148,17 @@ class VerifySerializer(serializers.ModelSerializer):
 
     @staticmethod
     def get_email(email: str) -> tuple[bool, str]:
-        try:
-            User.objects.get(email=email)
+        if not is_available('email', email):
             return False, "exist_email"
-        except User.DoesNotExist:
-            if email.rsplit("@", 1)[1] not in domain_allowlist:
-                return False, "invalid_domain"
-            return True, ""
+        if email.rsplit("@", 1)[1] not in domain_allowlist:
+            return False, "invalid_domain"
+        return True, ""
 
     @staticmethod
     def get_nickname(nickname: str) -> tuple[bool, str]:
-        try:
-            User.objects.get(nickname__exact=nickname)
+        if not is_available('nickname', nickname):
             return False, "exist_nickname"
-        except User.DoesNotExist:
-            return True, ""
+        return True, ""
 
 
 class UserSerializer(UserBaseSerializer):
@@ -223,10 +223,10 @@ class PasswordChangeSerializer(serializers.Serializer):
     new_passwd = serializers.CharField(required=True)
 
     def check_passwd(self, obj: User):
-        if not obj.check_password(self.data.get('old_passwd')):
+        if not password_hashing_pool.run(obj.check_password, self.data.get('old_passwd')):
             raise ValidationError(detail=_(f"wrong_passwd"))
         new_passwd = self.data.get('new_passwd')
         if new_passwd:
-            obj.set_password(new_passwd)
+            password_hashing_pool.run(obj.set_password, new_passwd)
             obj.save()
             return obj
@@ -1,5 +1,6 @@
 from apps.users.choices import SocialAccountTypeEnum
 from apps.users.models import User
+from utils.cache import add_user_identities, invalidate_user_cache
 
 
 def save_auth_id(sender, instance: User, **kwargs):
@@ -10,3 +11,15 @@ def save_auth_id(sender, instance: User, **kwargs):
         instance.auth_id = instance.id
         instance.processed = True
         instance.save()
+
+
+def invalidate_user(sender, instance: User, **kwargs):
+    # 사용자 정보 수정, 비밀번호 변경, 비활성화, 삭제 시 인증 cache 삭제
+    invalidate_user_cache(instance.id)
+
+
+def add_user_identity(sender, instance: User, **kwargs):
+    # 중복 검사용 이메일/닉네임 set 갱신 (변경 전 값은 남아 있어도 DB에서 다시 확인)
+    # 이메일은 unique가 아니므로 사용자 삭제 시에도 set에서 제거하지 않음 (다른 사용자가 같은 값을 사용 중일 수 있음)
+    add_user_identities('email', [instance.email])
+    add_user_identities('nickname', [instance.nickname])
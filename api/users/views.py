@@ -13,17 +13,19 @@ from rest_framework.decorators import action
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 from rest_framework.status import is_client_error
-from rest_framework.throttling import UserRateThrottle
 from rest_framework_tracking.mixins import LoggingMixin
 
 from api.users.logics import SocialLoginService
-from apps.users.models import UserLoginLog
+from apps.users.availability import suggest_nicknames
+from apps.users.login_logs import enqueue_login_log
 from api.users.serializers import *
 
 from core.exceptions import UserNotFound
 from core.serializers import ScribbleTokenObtainPairSerializer
-from core.throttling import AnonRateThrottle
+from core.throttling import AnonRateThrottle, UserRateThrottle
+from utils.cache import get_or_set_token_cache
 from utils.logging_utils import BraceStyleAdapter
+from utils.passwords import password_hashing_pool
 from utils.swagger import (
     swagger_response,
     swagger_parameter,
@@ -50,12 +52,13 @@ class SignInLoggingMixin(LoggingMixin):
         self.log['user_agent'] = user_agent
 
     def handle_log(self):
-        UserLoginLog(**self.log).save()
+        enqueue_login_log(self.log)
 
 
 class TokenObtainViewSet(viewsets.ModelViewSet):
     def process_signin_response(self, request, response):
         token = ScribbleTokenObtainPairSerializer.get_token(request.user)
+        get_or_set_token_cache(request=request, user_id=request.user.id, bind=True)
         response.data["access"] = str(token.access_token)
         response.data["refresh"] = str(token)
         response.set_cookie(
@@ -194,7 +197,7 @@ class UserViewSet(TokenObtainViewSet):
         data = json.loads(request.body)
         try:
             user = self.queryset.get(email=data["email"])
-            valid_passwd = check_password(data["password"], user.password)
+            valid_passwd = password_hashing_pool.run(check_password, data["password"], user.password)
             if not valid_passwd:
                 raise ValidationError(detail=_("invalid_password"))
         except User.DoesNotExist:
@@ -380,7 +383,12 @@ class UserViewSet(TokenObtainViewSet):
         if nickname:
             flag_n, n_msg = self.get_serializer_class().get_nickname(nickname)
             if not flag_n:
-                raise ValidationError(detail={"detail": n_msg, "recommend": nickname + str(randint(1, 100))})
+                recommends = suggest_nicknames(nickname)
+                raise ValidationError(detail={
+                    "detail": n_msg,
+                    "recommend": recommends[0] if recommends else None,
+                    "recommends": recommends
+                })
             return Response({"nickname": nickname}, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
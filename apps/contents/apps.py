@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
 
 
 class ContentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.contents'
+
+    def ready(self):
+        from api.main.signals import save_page, delete_page, invalidate_page_fragment, invalidate_author_fragments, \
+            invalidate_book_fragments
+        from apps.contents.models import BookObject, Page, PageLikesRelation, PageComment
+        from apps.users.models import User
+        post_save.connect(save_page, Page)
+        post_delete.connect(delete_page, Page)
+        for model in (PageLikesRelation, PageComment):
+            post_save.connect(invalidate_page_fragment, model)
+            post_delete.connect(invalidate_page_fragment, model)
+        post_save.connect(invalidate_author_fragments, User)
+        post_save.connect(invalidate_book_fragments, BookObject)
@@ -0,0 +1,97 @@
+import atexit
+import logging
+import threading
+from collections import defaultdict
+
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+from utils.cache import incr_hit_count, pop_hit_counts
+from utils.logging_utils import BraceStyleAdapter
+
+log = BraceStyleAdapter(logging.getLogger("apps.contents.hits"))
+
+HIT_COUNT_FLUSH_INTERVAL = 10
+
+
+def get_hit_models():
+    from apps.contents.models import Note, Page
+    return {'page': Page, 'note': Note}
+
+
+def flush_hit_counts():
+    """
+    buffer에 누적된 조회수를 `hit = hit + n` update로 반영합니다.
+    증가분(n)이 같은 row들은 하나의 update query로 묶어서 처리하며,
+    model 단위로 하나의 transaction에서 반영하므로 일부만 반영된 채 buffer로 되돌아가지 않습니다.
+    """
+    flushed = 0
+    for model_name, model in get_hit_models().items():
+        counts = pop_hit_counts(model_name)
+        if not counts:
+            continue
+
+        groups = defaultdict(list)
+        for pk, value in counts.items():
+            groups[value].append(pk)
+        try:
+            with transaction.atomic():
+                for value, pks in groups.items():
+                    model.objects.filter(id__in=pks).update(hit=F('hit') + value)
+        except Exception as e:
+            # rollback 되었으므로 전체 증가분을 다음 flush에서 다시 시도
+            log.error("hit count flush failed ({}): {}", model_name, e)
+            for pk, value in counts.items():
+                incr_hit_count(model_name, pk, value)
+            continue
+        flushed += len(counts)
+
+    return flushed
+
+
+class HitCountFlusher(threading.Thread):
+    def __init__(self, interval=HIT_COUNT_FLUSH_INTERVAL):
+        super().__init__(name='hit-count-flusher', daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        close_old_connections()
+        try:
+            flush_hit_counts()
+        except Exception as e:
+            log.error("hit count flush failed: {}", e)
+        finally:
+            close_old_connections()
+
+    def stop(self):
+        # worker 종료 시 남아있는 증가분을 반영
+        self.stopped.set()
+        self.flush()
+
+
+_flusher = None
+_flusher_lock = threading.Lock()
+
+
+def start_hit_count_flusher():
+    # gunicorn worker fork 이후 첫 조회 시점에 process 별로 한 번만 시작
+    global _flusher
+    if _flusher is not None:
+        return _flusher
+
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = HitCountFlusher()
+            _flusher.start()
+            atexit.register(_flusher.stop)
+    return _flusher
+
+
+def buffer_hit(model_name, pk):
+    incr_hit_count(model_name, pk)
+    start_hit_count_flusher()
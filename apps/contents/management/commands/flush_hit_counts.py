@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.contents.hits import flush_hit_counts
+
+
+class Command(BaseCommand):
+    help = 'redis에 누적된 페이지/노트 조회수를 DB에 반영합니다.'
+
+    def handle(self, *args, **options):
+        flushed = flush_hit_counts()
+        self.stdout.write(f'{flushed} rows flushed')
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from apps.contents.models import Note, NoteLikesRelation, Page, PageLikesRelation, PageComment
+
+
+# (model, 집계 컬럼, 실제 개수를 셀 relation model, relation의 FK 필드)
+COUNTERS = [
+    (Page, 'like_count', PageLikesRelation, 'page_id'),
+    (Page, 'comment_count', PageComment, 'page_id'),
+    (Note, 'like_count', NoteLikesRelation, 'note_id'),
+    (Note, 'page_count', Page, 'note_id'),
+]
+
+
+def count_subquery(relation, field):
+    queryset = relation.objects.filter(**{field: OuterRef('pk')}).order_by()\
+        .values(field).annotate(count=Count('id')).values('count')
+    return Coalesce(Subquery(queryset), Value(0))
+
+
+class Command(BaseCommand):
+    help = '페이지/노트의 좋아요, 댓글, 페이지 수 집계 컬럼을 실제 데이터 기준으로 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='수정하지 않고 차이가 있는 row 수만 출력합니다.')
+
+    def handle(self, *args, **options):
+        for model, column, relation, field in COUNTERS:
+            with transaction.atomic():
+                drifted = list(
+                    model.objects.alias(actual=count_subquery(relation, field))
+                    .exclude(**{column: F('actual')})
+                    .values_list('id', flat=True)
+                )
+                if drifted and not options['dry_run']:
+                    model.objects.filter(id__in=drifted).update(**{column: count_subquery(relation, field)})
+
+            self.stdout.write(f'{model._meta.db_table}.{column}: {len(drifted)} rows drifted')
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.4 on 2026-10-17 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0003_page_book_page'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='page',
+            index=models.Index(fields=['-created_at', '-id'], name='page_created_at_id_idx'),
+        ),
+    ]
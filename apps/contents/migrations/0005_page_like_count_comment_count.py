@@ -0,0 +1,54 @@
+# Generated by Django 4.0.4 on 2026-10-17 23:50
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_page_counts(apps, schema_editor):
+    Page = apps.get_model('contents', 'Page')
+    PageLikesRelation = apps.get_model('contents', 'PageLikesRelation')
+    PageComment = apps.get_model('contents', 'PageComment')
+
+    like_count = PageLikesRelation.objects.filter(page_id=OuterRef('pk'))\
+        .values('page_id').annotate(count=Count('id')).values('count')
+    comment_count = PageComment.objects.filter(page_id=OuterRef('pk'))\
+        .values('page_id').annotate(count=Count('id')).values('count')
+
+    Page.objects.update(
+        like_count=Coalesce(Subquery(like_count), Value(0)),
+        comment_count=Coalesce(Subquery(comment_count), Value(0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0004_page_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='page',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='댓글 수'),
+        ),
+        migrations.AddField(
+            model_name='page',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='좋아요 수'),
+        ),
+        migrations.RunPython(fill_page_counts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='page',
+            index=models.Index(fields=['hit', 'id'], name='page_hit_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='page',
+            index=models.Index(fields=['like_count', 'id'], name='page_like_count_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='page',
+            index=models.Index(fields=['comment_count', 'id'], name='page_comment_count_id_idx'),
+        ),
+    ]
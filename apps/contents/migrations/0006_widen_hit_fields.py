@@ -0,0 +1,23 @@
+# Generated by Django 4.0.4 on 2026-10-18 00:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0005_page_like_count_comment_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='note',
+            name='hit',
+            field=models.PositiveIntegerField(default=0, verbose_name='조회수'),
+        ),
+        migrations.AlterField(
+            model_name='page',
+            name='hit',
+            field=models.PositiveIntegerField(default=0, verbose_name='조회수'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.0.4 on 2026-10-18 00:40
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_note_counts(apps, schema_editor):
+    Note = apps.get_model('contents', 'Note')
+    NoteLikesRelation = apps.get_model('contents', 'NoteLikesRelation')
+    Page = apps.get_model('contents', 'Page')
+
+    like_count = NoteLikesRelation.objects.filter(note_id=OuterRef('pk'))\
+        .values('note_id').annotate(count=Count('id')).values('count')
+    page_count = Page.objects.filter(note_id=OuterRef('pk'))\
+        .values('note_id').annotate(count=Count('id')).values('count')
+
+    Note.objects.update(
+        like_count=Coalesce(Subquery(like_count), Value(0)),
+        page_count=Coalesce(Subquery(page_count), Value(0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0006_widen_hit_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='note',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='좋아요 수'),
+        ),
+        migrations.AddField(
+            model_name='note',
+            name='page_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='페이지 수'),
+        ),
+        migrations.RunPython(fill_note_counts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['user', 'hit', 'id'], name='note_user_hit_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['user', 'like_count', 'id'], name='note_user_like_count_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['user', 'page_count', 'id'], name='note_user_page_count_id_idx'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.0.4 on 2026-10-18 01:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_comment_thread(apps, schema_editor):
+    PageComment = apps.get_model('contents', 'PageComment')
+
+    # 부모 댓글이 먼저 처리되도록 depth 순으로 조회
+    threads = {}
+    comments = []
+    for comment in PageComment.objects.order_by('depth', 'id').iterator():
+        parent = threads.get(comment.legacy_parent)
+        if comment.legacy_parent and parent and parent['page_id'] == comment.page_id:
+            comment.parent_id = comment.legacy_parent
+            comment.root_id = parent['root_id']
+            comment.path = f"{parent['path']}/{comment.id:010d}"
+            comment.depth = parent['depth'] + 1
+        else:
+            comment.parent_id, comment.root_id = None, comment.id
+            comment.path, comment.depth = f'{comment.id:010d}', 0
+
+        threads[comment.id] = {
+            'page_id': comment.page_id, 'root_id': comment.root_id, 'path': comment.path, 'depth': comment.depth
+        }
+        comments.append(comment)
+
+    PageComment.objects.bulk_update(comments, ['parent', 'root', 'path', 'depth'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0007_note_like_count_page_count'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='pagecomment',
+            old_name='parent',
+            new_name='legacy_parent',
+        ),
+        migrations.AddField(
+            model_name='pagecomment',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='replies', to='contents.pagecomment', verbose_name='부모 댓글'),
+        ),
+        migrations.AddField(
+            model_name='pagecomment',
+            name='root',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='thread', to='contents.pagecomment', verbose_name='최상위 댓글'),
+        ),
+        migrations.AddField(
+            model_name='pagecomment',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=500, verbose_name='댓글 경로'),
+        ),
+        migrations.RunPython(fill_comment_thread, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='pagecomment',
+            name='legacy_parent',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.4 on 2026-10-18 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0008_pagecomment_parent_fk_root_path'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pagecomment',
+            index=models.Index(fields=['page', 'created_at', 'id'], name='page_comment_page_created_idx'),
+        ),
+    ]
@@ -1,9 +1,13 @@
-from django.db import models
-from django.db.models import UniqueConstraint
+from django.db import models, transaction
+from django.db.models import UniqueConstraint, F, Prefetch, Window, prefetch_related_objects
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest, RowNumber
 
 from core.fields import ISBNField
 from core.models import TimeStampModel, Default
 from apps.users.models import User
+from apps.contents.hits import buffer_hit
+from utils.cache import delete_page_fragments
 
 
 DEFAULT_MODEL_PK = Default(
@@ -14,6 +18,13 @@ DEFAULT_MODEL_PK = Default(
     page_comment=4
 )
 
+# 페이지 상세 조회 시 함께 조회하는 최상위 댓글(thread) 수
+PAGE_COMMENT_PREVIEW_SIZE = 10
+
+# 댓글 경로(path)의 최대 길이와 허용되는 최대 depth (id 10자리 + '/' 구분자)
+PAGE_COMMENT_PATH_MAX_LENGTH = 500
+PAGE_COMMENT_MAX_DEPTH = (PAGE_COMMENT_PATH_MAX_LENGTH - 10) // 11
+
 
 class BookObject(TimeStampModel):
     isbn = ISBNField(normalize_isbn=True, unique=True)
@@ -45,6 +56,14 @@ class BookObject(TimeStampModel):
         ordering = ['created_at']
 
 
+class NoteQuerySet(models.QuerySet):
+    def with_detail(self):
+        # NoteSerializer에서 사용하는 작성자, 도서, 좋아요 사용자를 한 번에 조회
+        return self.select_related('user', 'book').prefetch_related(
+            Prefetch('note_likes_relation', queryset=NoteLikesRelation.objects.select_related('like_user'))
+        )
+
+
 class Note(TimeStampModel):
     user = models.ForeignKey(
         User,
@@ -58,16 +77,32 @@ class Note(TimeStampModel):
         related_name='note',
         verbose_name='도서'
     )
-    hit = models.PositiveSmallIntegerField(
+    hit = models.PositiveIntegerField(
         default=0,
         verbose_name='조회수'
     )
+    # 노트 조회/정렬(사용자 메인 화면)용 집계 컬럼
+    like_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='좋아요 수'
+    )
+    page_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='페이지 수'
+    )
+
+    objects = NoteQuerySet.as_manager()
 
     class Meta:
         db_table = 'note'
         verbose_name = '필사 노트'
         verbose_name_plural = verbose_name
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['user', 'hit', 'id'], name='note_user_hit_id_idx'),
+            models.Index(fields=['user', 'like_count', 'id'], name='note_user_like_count_id_idx'),
+            models.Index(fields=['user', 'page_count', 'id'], name='note_user_page_count_id_idx'),
+        ]
         # TASK 4: 동일한 user, book에 대하여 여러 개의 note object가 생성되는 버그 수정 (UniqueConstraint 지정)
         constraints = [
             UniqueConstraint(
@@ -77,8 +112,17 @@ class Note(TimeStampModel):
         ]
 
     def update_note_hit(self):
+        # 조회수는 buffer에 누적 후 주기적으로 반영 (응답에는 증가된 값을 사용)
+        buffer_hit('note', self.id)
         self.hit += 1
-        self.save()
+
+    def update_like_count(self, value=1):
+        Note.objects.filter(id=self.id).update(like_count=Greatest(F('like_count') + value, 0))
+        self.like_count = max(self.like_count + value, 0)
+
+    def update_page_count(self, value=1):
+        Note.objects.filter(id=self.id).update(page_count=Greatest(F('page_count') + value, 0))
+        self.page_count = max(self.page_count + value, 0)
 
 
 class NoteLikesRelation(TimeStampModel):
@@ -101,6 +145,38 @@ class NoteLikesRelation(TimeStampModel):
         verbose_name_plural = verbose_name
 
 
+class PageQuerySet(models.QuerySet):
+    def with_likes(self):
+        return self.prefetch_related(
+            Prefetch('page_likes_relation', queryset=PageLikesRelation.objects.select_related('like_user'))
+        )
+
+    def with_detail(self):
+        # 페이지 개수, 좋아요 수와 관계없이 일정한 수의 query로 PageDetailSerializer 데이터를 조회
+        # 댓글은 조회한 페이지 목록에 prefetch_comment_previews()로 따로 조회
+        return self.with_likes().select_related('note__user', 'note__book')
+
+
+def prefetch_comment_previews(pages, comment_limit=PAGE_COMMENT_PREVIEW_SIZE):
+    """
+    페이지별로 (created_at, id) 순 앞의 comment_limit + 1개 thread(다음 cursor 존재 여부 확인용)의 댓글만 prefetch 합니다.
+    window function으로 최상위 댓글의 순위를 먼저 구한 뒤, 해당 thread의 댓글만 root_id로 조회합니다.
+    """
+    pages = list(pages)
+    if not pages:
+        return pages
+
+    ranked_roots = PageComment.objects.filter(page_id__in=[page.id for page in pages], parent__isnull=True)\
+        .annotate(root_rank=Window(RowNumber(), partition_by=[F('page_id')], order_by=[F('created_at').asc(), F('id').asc()]))\
+        .order_by().values('id', 'root_rank')
+    sql, params = ranked_roots.query.sql_with_params()
+    root_ids = RawSQL(f'SELECT id FROM ({sql}) ranked_root WHERE root_rank <= %s', (*params, comment_limit + 1))
+    comments = PageComment.objects.filter(root_id__in=root_ids).select_related('comment_user').order_by('path')
+
+    prefetch_related_objects(pages, Prefetch('page_comment', queryset=comments))
+    return pages
+
+
 class Page(TimeStampModel):
     note = models.ForeignKey(
         Note,
@@ -124,7 +200,7 @@ class Page(TimeStampModel):
         null=True,
         verbose_name='필사 구절'
     )
-    hit = models.PositiveSmallIntegerField(
+    hit = models.PositiveIntegerField(
         default=0,
         verbose_name='조회수'
     )
@@ -133,16 +209,48 @@ class Page(TimeStampModel):
         verbose_name='책페이지',
         blank=True
     )
+    # 메인 화면 정렬(mode=likes/reviews)용 집계 컬럼
+    like_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='좋아요 수'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='댓글 수'
+    )
+
+    objects = PageQuerySet.as_manager()
 
     class Meta:
         db_table = 'page'
         verbose_name = '필사 페이지'
         verbose_name_plural = verbose_name
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='page_created_at_id_idx'),
+            models.Index(fields=['hit', 'id'], name='page_hit_id_idx'),
+            models.Index(fields=['like_count', 'id'], name='page_like_count_id_idx'),
+            models.Index(fields=['comment_count', 'id'], name='page_comment_count_id_idx'),
+        ]
 
     def update_page_hit(self):
+        buffer_hit('page', self.id)
         self.hit += 1
-        self.save()
+
+    def update_like_count(self, value=1):
+        Page.objects.filter(id=self.id).update(like_count=Greatest(F('like_count') + value, 0))
+        self.like_count = max(self.like_count + value, 0)
+        self.invalidate_fragment()
+
+    def update_comment_count(self, value=1):
+        Page.objects.filter(id=self.id).update(comment_count=Greatest(F('comment_count') + value, 0))
+        self.comment_count = max(self.comment_count + value, 0)
+        self.invalidate_fragment()
+
+    def invalidate_fragment(self):
+        # 수가 반영된 이후 삭제해야 그 사이 조회에서 이전 값이 다시 cache 되지 않음
+        page_id = self.id
+        transaction.on_commit(lambda: delete_page_fragments([page_id]))
 
     def save_new_note_index(self):
         index_list = Page.objects.filter(note_id=self.note.id).values_list('note_index', flat=True)
@@ -190,9 +298,29 @@ class PageComment(TimeStampModel):
         default=0,
         verbose_name='댓글 depth'
     )
-    parent = models.PositiveSmallIntegerField(
-        default=0,
-        verbose_name='부모 댓글 idx'
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='replies',
+        verbose_name='부모 댓글'
+    )
+    root = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='thread',
+        verbose_name='최상위 댓글'
+    )
+    # 최상위 댓글부터 자신까지의 id를 '/'로 연결한 경로 (정렬 시 댓글 thread 순서)
+    path = models.CharField(
+        max_length=PAGE_COMMENT_PATH_MAX_LENGTH,
+        blank=True,
+        default='',
+        db_index=True,
+        verbose_name='댓글 경로'
     )
     content = models.TextField(
         verbose_name='내용'
@@ -202,3 +330,23 @@ class PageComment(TimeStampModel):
         db_table = 'page_comment'
         verbose_name = '페이지 댓글'
         verbose_name_plural = verbose_name
+        indexes = [
+            models.Index(fields=['page', 'created_at', 'id'], name='page_comment_page_created_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        super(PageComment, self).save(*args, **kwargs)
+        if not self.path:
+            self.save_thread_path()
+
+    def save_thread_path(self):
+        parent = self.parent
+        self.root_id = parent.root_id if parent else self.id
+        self.path = f'{parent.path}/{self.id:010d}' if parent else f'{self.id:010d}'
+        PageComment.objects.filter(id=self.id).update(root_id=self.root_id, path=self.path)
+
+    def get_ancestor_ids(self):
+        return [int(comment_id) for comment_id in self.path.split('/')[:-1]]
+
+    def get_descendants(self):
+        return PageComment.objects.filter(path__startswith=self.path + '/')
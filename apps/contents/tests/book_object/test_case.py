@@ -1,13 +1,22 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
 from faker import Faker
 from faker.providers.isbn import Provider
 
+from django.core.cache import caches
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.test import APIClient, APITestCase
 
 from .factories import BookObjectFactory
+from api.contents.book_object.serializers import BookCreateSerializer
+from apps.contents.models import BookObject
 from core.validators import ISBNValidator
-from utils.naver_api import NaverSearchAPI
+from utils.http import CircuitBreaker, CircuitOpenError, HttpClient, OutboundRequestError
+from utils.metrics import get_metrics
+from utils.naver_api import NaverQuotaGovernor, NaverSearchAPI, NaverSearchCache, SearchUnavailable, naver_circuit
 
 
 class BookObjectTestCase(APITestCase):
@@ -87,3 +96,230 @@ class BookObjectTestCase(APITestCase):
             'invalid_isbn_not_string' or 'invalid_isbn_wrong_length' or 'invalid_isbn_failed_checksum'
             in response.data
         )
+
+
+class FakeNaverSearchAPI(NaverSearchAPI):
+    # 네이버 API를 호출하지 않고 요청 url을 기록
+    def __init__(self, results=None, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = NaverSearchCache()
+        self.results = results or {}
+        self.requests = []
+
+    def send_request(self, req_url):
+        self.requests.append(req_url)
+        for prefix, items in self.results.items():
+            if req_url.startswith(prefix):
+                return items
+        return []
+
+
+class NaverSearchCacheTestCase(APITestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.item = {
+            "isbn": "8901234567 9788901234567",
+            "title": "<b>title</b>",
+            "author": "author",
+            "publisher": "publisher",
+            "image": "https://example.com/image.jpg?type=m1"
+        }
+
+    def test_given_same_normalized_query_expect_single_upstream_search(self):
+        api = FakeNaverSearchAPI({NaverSearchAPI.title_url: [self.item] * 6})
+        before = get_metrics()['counters']
+
+        result = api('Search  Query')
+        self.assertEqual(api('search query'), result)
+        self.assertEqual(result[0], 'title')
+        self.assertEqual(len(api.requests), 1)
+        self.assertEqual(api.cache.stats(), {'local_size': 1, 'local_hits': 1, 'remote_hits': 0, 'misses': 1})
+        counters = get_metrics()['counters']
+        for name in ('naver_search_cache.local_hits', 'naver_search_cache.misses'):
+            self.assertEqual(counters[name], before.get(name, 0) + 1)
+
+    def test_given_shared_instance_expect_display_per_call(self):
+        api = FakeNaverSearchAPI()
+        api('first query', 3)
+        api('second query')
+
+        self.assertTrue(api.requests[0].endswith('&display=3'))
+        self.assertTrue(api.requests[-1].endswith('&display=' + str(NaverSearchAPI.default_display)))
+        self.assertFalse(hasattr(api, 'display'))
+
+    def test_given_empty_result_expect_negative_cached(self):
+        api = FakeNaverSearchAPI()
+        self.assertEqual(api('no result'), ('author_pubilsher', []))
+        api('no result')
+        self.assertEqual(len(api.requests), 2)
+
+    def test_given_restarted_worker_expect_result_served_from_shared_cache(self):
+        FakeNaverSearchAPI({NaverSearchAPI.title_url: [self.item] * 6})('search query')
+
+        api = FakeNaverSearchAPI()
+        self.assertEqual(api('search query')[0], 'title')
+        self.assertEqual(api.requests, [])
+        self.assertEqual(api.cache.stats()['remote_hits'], 1)
+
+
+class NaverConcurrentSearchTestCase(APITestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.item = {"isbn": "9788901234567", "title": "t", "author": "a", "publisher": "p", "image": ""}
+
+    def test_given_few_title_results_expect_requests_sent_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        class ConcurrentFakeNaverSearchAPI(FakeNaverSearchAPI):
+            def send_request(self, req_url):
+                # 두 요청이 동시에 진행 중이어야 통과
+                barrier.wait()
+                return super().send_request(req_url)
+
+        api = ConcurrentFakeNaverSearchAPI({
+            NaverSearchAPI.title_url: [self.item],
+            NaverSearchAPI.query_url: [self.item] * 3
+        }, concurrent_fallback=True)
+
+        search_type, result = api('search query')
+        self.assertEqual(search_type, 'author_pubilsher')
+        self.assertEqual(len(result), 3)
+
+    def test_given_enough_title_results_expect_title_search_type(self):
+        api = FakeNaverSearchAPI({NaverSearchAPI.title_url: [self.item] * 6}, concurrent_fallback=True)
+        self.assertEqual(api('search query')[0], 'title')
+        # 제목 검색 결과가 충분하면 재검색 요청은 보내지 않음
+        time.sleep(api.fallback_delay + 0.05)
+        self.assertEqual(len(api.requests), 1)
+
+
+class UnavailableNaverSearchAPI(FakeNaverSearchAPI):
+    def send_request(self, req_url):
+        self.requests.append(req_url)
+        raise SearchUnavailable()
+
+
+class NaverSearchDegradedTestCase(APITestCase):
+    def setUp(self):
+        caches['default'].clear()
+
+    def test_circuit_breaker_half_open_probe(self):
+        circuit = CircuitBreaker('test', failure_threshold=2, reset_timeout=0.05)
+        circuit.record_failure()
+        circuit.before_call()
+        circuit.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            circuit.before_call()
+
+        time.sleep(0.06)
+        circuit.before_call()
+        with self.assertRaises(CircuitOpenError):
+            circuit.before_call()
+        circuit.record_success()
+        circuit.before_call()
+        self.assertEqual(circuit.state, CircuitBreaker.CLOSED)
+
+    def test_circuit_breaker_release_half_open_probe(self):
+        circuit = CircuitBreaker('test', failure_threshold=1, reset_timeout=0.05)
+        circuit.record_failure()
+        time.sleep(0.06)
+        circuit.before_call()
+
+        # quota 부족으로 요청을 보내지 않은 경우 다음 요청이 다시 probe
+        circuit.release()
+        circuit.before_call()
+        self.assertEqual(circuit.state, CircuitBreaker.HALF_OPEN)
+
+    def test_given_no_redis_expect_quota_always_allowed(self):
+        governor = NaverQuotaGovernor()
+        before = get_metrics()['counters'].get('naver_quota.allowed.background', 0)
+        self.assertTrue(governor.acquire(NaverQuotaGovernor.INTERACTIVE))
+        self.assertTrue(governor.acquire(NaverQuotaGovernor.BACKGROUND))
+        self.assertEqual(governor.stats()['denied'], {'interactive': 0, 'background': 0})
+        self.assertEqual(get_metrics()['counters']['naver_quota.allowed.background'], before + 1)
+        self.assertEqual(NaverSearchAPI(priority='background').priority, NaverQuotaGovernor.BACKGROUND)
+
+    def test_given_unavailable_upstream_expect_stale_result(self):
+        api = UnavailableNaverSearchAPI()
+        key = api.cache.make_key('search query', api.default_display)
+        caches['default'].set(key, (('title', [{'isbn': '9788901234567'}]), time.time() - 1))
+
+        self.assertEqual(api.search_with_status('search query'), ('title', [{'isbn': '9788901234567'}], True))
+
+    def test_given_unavailable_upstream_for_isbn_expect_single_attempt(self):
+        for concurrent_fallback in (False, True):
+            api = UnavailableNaverSearchAPI(concurrent_fallback=concurrent_fallback)
+            search_type, items, degraded = api.search_with_status("9791166832598")
+
+            self.assertEqual((search_type, items, degraded), ('local', [], True))
+            self.assertEqual(len(api.requests), 1)
+            self.assertTrue(api.requests[0].startswith(NaverSearchAPI.isbn_url))
+
+    def test_given_unavailable_upstream_without_cache_expect_local_books(self):
+        book = BookObjectFactory.create()
+        search_type, items, degraded = UnavailableNaverSearchAPI().search_with_status(book.title)
+
+        self.assertEqual((search_type, degraded), ('local', True))
+        self.assertEqual([item['isbn'] for item in items], [book.isbn])
+
+
+    def test_given_unavailable_upstream_expect_book_new_not_created_from_other_book(self):
+        isbn = "9791166832598"
+        BookObjectFactory.create(title=f"{isbn} 해설")
+        for _ in range(naver_circuit.failure_threshold):
+            naver_circuit.record_failure()
+        try:
+            with self.assertRaises(SearchUnavailable) as ctx:
+                BookCreateSerializer().create(validated_data={"isbn": isbn})
+            response = APIClient().get(path="http://127.0.0.1:8000/v1/contents/books/search/navbar", data={"query": "title"})
+        finally:
+            naver_circuit.record_success()
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['X-Search-Degraded'], 'true')
+        self.assertFalse("degraded" in response.data)
+        self.assertFalse(BookObject.objects.filter(isbn=isbn).exists())
+
+
+class HttpClientTestCase(APITestCase):
+    def setUp(self):
+        statuses = self.statuses = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                code = statuses.pop(0) if statuses else 200
+                self.send_response(code)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'{}')
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_given_temporary_error_expect_retried(self):
+        self.statuses.extend([503, 503])
+        client = HttpClient(retries=2, backoff=0)
+
+        response = client.get(self.url)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(client.stats()['127.0.0.1']['requests'], 3)
+        self.assertEqual(client.stats()['127.0.0.1']['errors'], 2)
+
+    def test_given_retries_exhausted_expect_last_response_or_error(self):
+        self.statuses.extend([503, 503])
+        self.assertEqual(HttpClient(retries=1, backoff=0).get(self.url).status, 503)
+
+        self.server.shutdown()
+        self.server.server_close()
+        with self.assertRaises(OutboundRequestError):
+            HttpClient(retries=1, backoff=0).get(self.url)
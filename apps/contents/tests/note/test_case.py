@@ -1,6 +1,9 @@
+from io import StringIO
+
 from faker import Faker
 from faker.providers.isbn import Provider
 
+from django.core.management import call_command
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
@@ -198,3 +201,21 @@ class NoteTestCase(APITestCase):
         url_2 = self.url_prefix + str(note_user_with_other_user.id) + "/like/cancel"
         response = self.client.delete(path=url_2)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_given_like_and_drift_expect_note_counters_reconciled(self):
+        note = NoteFactory.create(user=UserFactory.create())
+        response = self.client.post(path=self.url_prefix + str(note.id) + "/like")
+        self.assertEqual(response.data['note']['like_count'], 1)
+        note.refresh_from_db()
+        self.assertEqual(note.like_count, 1)
+
+        note.note_likes_relation.all().delete()
+        out = StringIO()
+        call_command('reconcile_counters', '--dry-run', stdout=out)
+        self.assertTrue("note.like_count: 1 rows drifted" in out.getvalue())
+        note.refresh_from_db()
+        self.assertEqual(note.like_count, 1)
+
+        call_command('reconcile_counters', stdout=StringIO())
+        note.refresh_from_db()
+        self.assertEqual(note.like_count, 0)
@@ -1,10 +1,21 @@
+import json
+from io import StringIO
+from unittest import mock
+
 from factory import fuzzy
 from faker import Faker
 
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db.models import QuerySet
 from rest_framework import status
 
 from apps.contents.tests.note.factories import NoteFactory
+from api.contents.page.serializers import PageSerializer
+from apps.contents.hits import flush_hit_counts
+from apps.contents.models import Page, PageLikesRelation
 from apps.contents.tests.page.factories import PageFactory
+from apps.contents.tests.page_comment.factories import PageCommentFactory
 
 from apps.users.tests.user.factories import UserFactory
 from apps.users.tests.user.test_case import UserTestCase
@@ -79,6 +90,48 @@ class PageTestCase(UserTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(page.id, response.data["page_detail"]["id"])
 
+    def test_given_page_view_by_other_user_expect_hit_buffered_until_flush(self):
+        flush_hit_counts()
+        page = PageFactory.create(hit=0)
+        updated_at = page.updated_at
+        for _ in range(2):
+            response = self.client.get(path=self.url_prefix + str(page.id))
+        self.assertEqual(response.data["page_detail"]["hit"], 1)
+
+        page.refresh_from_db()
+        self.assertEqual(page.hit, 0)
+
+        flush_hit_counts()
+        page.refresh_from_db()
+        self.assertEqual(page.hit, 2)
+        self.assertEqual(page.updated_at, updated_at)
+
+    def test_given_flush_failed_partway_expect_hits_applied_once(self):
+        flush_hit_counts()
+        pages = PageFactory.create_batch(2, hit=0)
+        for count, page in enumerate(pages, start=1):
+            for _ in range(count):
+                self.client.get(path=self.url_prefix + str(page.id))
+
+        # 증가분이 다른 두 group 중 두 번째 update에서 실패
+        update, calls = QuerySet.update, []
+
+        def failing_update(queryset, **kwargs):
+            calls.append(queryset)
+            if len(calls) == 2:
+                raise RuntimeError("update failed")
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', failing_update):
+            flush_hit_counts()
+        for page in pages:
+            page.refresh_from_db()
+            self.assertEqual(page.hit, 0)
+
+        flush_hit_counts()
+        hits = Page.objects.filter(id__in=[page.id for page in pages]).order_by('id').values_list('hit', flat=True)
+        self.assertEqual(list(hits), [1, 2])
+
     def test_given_no_exist_page_pk_expect_page_edit_fail(self):
         base_url = self.url_prefix + str(1) + "/edit"
 
@@ -129,3 +182,148 @@ class PageTestCase(UserTestCase):
 
         response = self.client.delete(path=base_url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class MainViewTestCase(UserTestCase):
+    def setUp(self):
+        super(MainViewTestCase, self).setUp()
+        self.url_prefix = "http://127.0.0.1:8000/v1/main/"
+        caches['default'].clear()
+        self.pages = [PageFactory.create(note__user=self.user) for _ in range(5)]
+
+    def test_given_no_params_expect_main_pages_from_snapshot_without_query(self):
+        response = self.client.get(path=self.url_prefix)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(path=self.url_prefix)
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual([p["page_detail"]["id"] for p in response.data["pages"]], [p.id for p in reversed(self.pages)][:4])
+
+    def test_given_new_and_deleted_pages_expect_main_snapshot_updated(self):
+        self.client.get(path=self.url_prefix)
+        serializer = PageSerializer(many=True, context={'note': self.pages[0].note})
+        with self.captureOnCommitCallbacks(execute=True):
+            pages = serializer.create([{"transcript": Faker().image_url()} for _ in range(2)])
+        new_ids = sorted([p.id for p in pages], reverse=True)
+
+        response = self.client.get(path=self.url_prefix)
+        self.assertEqual(response.data["count"], 7)
+        self.assertEqual([p["page_detail"]["id"] for p in response.data["pages"]][:2], new_ids)
+
+        self.client.delete(path=f"http://127.0.0.1:8000/v1/contents/pages/{new_ids[0]}/delete")
+        response = self.client.get(path=self.url_prefix)
+        self.assertEqual(response.data["count"], 6)
+        self.assertEqual(response.data["pages"][0]["page_detail"]["id"], new_ids[1])
+
+    def test_given_single_page_created_expect_prepended_to_main_snapshot(self):
+        self.client.get(path=self.url_prefix)
+        with self.captureOnCommitCallbacks(execute=True):
+            page = PageFactory.create(note=self.pages[0].note)
+
+        # snapshot은 다시 만들지 않고 새 page의 fragment만 조회 (page / 좋아요 / 댓글)
+        with self.assertNumQueries(3):
+            response = self.client.get(path=self.url_prefix)
+        self.assertEqual(response.data["count"], 6)
+        self.assertEqual(response.data["pages"][0]["page_detail"]["id"], page.id)
+
+    def test_given_like_and_author_update_expect_main_fragment_refreshed(self):
+        self.client.get(path=self.url_prefix)
+        page, author = self.pages[-1], self.user
+        self.set_credentials_for_new_user()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(path=f"http://127.0.0.1:8000/v1/contents/pages/{page.id}/like")
+        response = self.client.get(path=self.url_prefix)
+        self.assertEqual(response.data["pages"][0]["page_detail"]["like_count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            author.nickname = "changed"
+            author.save()
+        response = self.client.get(path=self.url_prefix)
+        self.assertEqual(response.data["pages"][0]["page_author"]["nickname"], "changed")
+
+    def test_given_cursor_param_expect_main_keyset_pages_without_count(self):
+        response = self.client.get(path=self.url_prefix, data={"cursor": "", "limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse("count" in response.data)
+        self.assertIsNone(response.data["previous_cursor"])
+        first_ids = [p["page_detail"]["id"] for p in response.data["pages"]]
+        self.assertEqual(first_ids, [p.id for p in reversed(self.pages)][:2])
+
+        response = self.client.get(path=self.url_prefix, data={"cursor": response.data["next_cursor"], "limit": 2})
+        second_ids = [p["page_detail"]["id"] for p in response.data["pages"]]
+        self.assertEqual(second_ids, [p.id for p in reversed(self.pages)][2:4])
+
+        response = self.client.get(path=self.url_prefix, data={"cursor": response.data["previous_cursor"], "limit": 2})
+        self.assertEqual([p["page_detail"]["id"] for p in response.data["pages"]], first_ids)
+
+    def test_given_invalid_cursor_expect_main_fail(self):
+        response = self.client.get(path=self.url_prefix, data={"cursor": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue("invalid_cursor" in response.data)
+
+    def test_given_likes_mode_expect_main_pages_ordered_by_like_count(self):
+        for i, page in enumerate(self.pages):
+            for _ in range(i % 3):
+                self.client.post(path=f"http://127.0.0.1:8000/v1/contents/pages/{page.id}/like")
+                self.set_credentials_for_new_user()
+
+        response = self.client.get(path=self.url_prefix, data={"mode": "likes", "sorting": "descending", "cursor": ""})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        like_counts = [p["page_detail"]["like_count"] for p in response.data["pages"]]
+        self.assertEqual(like_counts, sorted(like_counts, reverse=True))
+        self.assertEqual(like_counts[0], 2)
+
+    def test_given_likes_and_comments_expect_main_pages_in_constant_queries(self):
+        for page in self.pages:
+            for _ in range(3):
+                PageLikesRelation.objects.create(like_user=UserFactory.create(), page=page)
+            root = PageCommentFactory.create(page=page, depth=0)
+            PageCommentFactory.create(page=page, parent=root, depth=1)
+        call_command('reconcile_counters', stdout=StringIO())
+
+        # page(note, book, author) / 좋아요(사용자) / 댓글(작성자)
+        with self.assertNumQueries(3):
+            response = self.client.get(path=self.url_prefix, data={"cursor": "", "limit": 5})
+        page_detail = response.data["pages"][0]["page_detail"]
+        self.assertEqual(page_detail["like_count"], 3)
+        self.assertEqual(len(page_detail["like_user"]), 3)
+        self.assertEqual(response.data["pages"][0]["page_comments"][1]["parent"]["id"],
+                         response.data["pages"][0]["page_comments"][0]["id"])
+
+    def test_given_pages_key_expect_user_main_notes_sorted_and_paginated(self):
+        note = self.pages[0].note
+        for _ in range(3):
+            PageFactory.create(note=note)
+        call_command('reconcile_counters', stdout=StringIO())
+
+        self.client.get(path=self.url_prefix + str(self.user.id))
+        with self.assertNumQueries(4):
+            response = self.client.get(path=self.url_prefix + str(self.user.id),
+                                       data={"key": "pages", "sorting": "descending", "limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(response.data["next_offset"], 2)
+        self.assertEqual([n["id"] for n in response.data["notes"]][0], note.id)
+        self.assertEqual(response.data["notes"][0]["pages_count"], 4)
+        self.assertEqual(response.data["user"]["id"], self.user.id)
+
+    def test_given_no_pagination_params_expect_main_note_list_streamed(self):
+        response = self.client.get(path=self.url_prefix + f"{self.user.id}/notes")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(data["status"], "success")
+        self.assertEqual([n["note_id"] for n in data["data"]], [p.note.id for p in reversed(self.pages)])
+        self.assertTrue(data["data"][0]["datetime"].endswith("Z"))
+
+    def test_given_limit_expect_main_note_list_paginated(self):
+        response = self.client.get(path=self.url_prefix + f"{self.user.id}/notes", data={"limit": 2, "offset": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual([n["note_id"] for n in response.data["notes"]], [p.note.id for p in reversed(self.pages)][2:4])
+
+    def set_credentials_for_new_user(self):
+        self.user = UserFactory.create()
+        self.set_credentials()
@@ -12,5 +12,5 @@ class PageCommentFactory(factory.django.DjangoModelFactory):
     comment_user = factory.SubFactory(UserFactory)
     page = factory.SubFactory(PageFactory)
     depth = fuzzy.FuzzyInteger(low=0)
-    parent = fuzzy.FuzzyInteger(low=0)
+    parent = None
     content = fuzzy.FuzzyText()
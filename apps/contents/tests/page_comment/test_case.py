@@ -2,6 +2,7 @@ from factory import fuzzy
 
 from rest_framework import status
 
+from apps.contents.models import PAGE_COMMENT_MAX_DEPTH, Page, prefetch_comment_previews
 from apps.contents.tests.page.factories import NoteFactory, PageFactory
 from apps.contents.tests.page_comment.factories import PageCommentFactory
 
@@ -97,6 +98,19 @@ class PageCommentTestCase(UserTestCase):
         self.assertEqual(page_comment.depth + 1, response.data["page_comment"]["depth"])
         self.assertEqual(page_comment.id, response.data["page_comment"]["parent"]["id"])
 
+    def test_given_parent_comment_at_max_depth_expect_page_comment_new_fail(self):
+        page = PageFactory.create()
+        page_comment = PageCommentFactory.create(page=page, depth=PAGE_COMMENT_MAX_DEPTH)
+        data = {
+            "page": int(page.id),
+            "parent": int(page_comment.id),
+            "content": fuzzy.FuzzyText().fuzz()
+        }
+
+        response = self.client.post(path=self.url_prefix + "new", data=data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue("max_comment_depth_exceeded" in response.data)
+
     def test_given_no_exist_page_comment_pk_expect_page_comment_edit_fail(self):
         base_url = self.url_prefix + str(1) + "/edit"
 
@@ -146,3 +160,58 @@ class PageCommentTestCase(UserTestCase):
         response = self.client.delete(path=base_url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
+
+    def test_given_nested_replies_expect_page_comment_thread_in_path_order(self):
+        page = PageFactory.create()
+        root = PageCommentFactory.create(page=page, depth=0)
+        other_root = PageCommentFactory.create(page=page, depth=0)
+        reply = PageCommentFactory.create(page=page, parent=root, depth=1)
+        nested_reply = PageCommentFactory.create(page=page, parent=reply, depth=2)
+        self.assertEqual(nested_reply.root_id, root.id)
+
+        response = self.client.get(path=self.url_prefix + str(nested_reply.id))
+        self.assertEqual(response.data["page_comment"]["parent"]["parent"]["id"], root.id)
+
+        response = self.client.get(path=f"http://127.0.0.1:8000/v1/contents/pages/{page.id}")
+        comments = response.data["page_comments"]
+        self.assertEqual([c["id"] for c in comments], [root.id, reply.id, nested_reply.id, other_root.id])
+        self.assertEqual(comments[2]["parent"]["parent"]["id"], root.id)
+
+    def test_given_comment_with_replies_expect_replies_deleted_and_count_updated(self):
+        page = PageFactory.create()
+        page_comment = PageCommentFactory.create(page=page, comment_user=self.user, depth=0)
+        PageCommentFactory.create(page=page, parent=page_comment, depth=1)
+        page.update_comment_count(2)
+
+        response = self.client.delete(path=self.url_prefix + str(page_comment.id) + "/delete")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        page.refresh_from_db()
+        self.assertEqual(page.comment_count, 0)
+        self.assertFalse(page.page_comment.exists())
+
+    def test_given_many_comments_expect_page_detail_preview_and_comment_list_cursor(self):
+        page = PageFactory.create()
+        roots = [PageCommentFactory.create(page=page, depth=0) for _ in range(12)]
+        reply = PageCommentFactory.create(page=page, parent=roots[-1], depth=1)
+
+        response = self.client.get(path=f"http://127.0.0.1:8000/v1/contents/pages/{page.id}")
+        self.assertEqual([c["id"] for c in response.data["page_comments"]], [r.id for r in roots[:10]])
+        cursor = response.data["page_comments_cursor"]
+        self.assertIsNotNone(cursor)
+
+        response = self.client.get(path=self.url_prefix + f"pages/{page.id}", data={"cursor": cursor})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([c["id"] for c in response.data["page_comments"]], [roots[10].id, roots[11].id, reply.id])
+        self.assertEqual(response.data["page_comments"][2]["parent"]["id"], roots[11].id)
+        self.assertIsNone(response.data["next_cursor"])
+
+        # 미리보기 범위(앞의 11개 thread) 밖의 댓글은 조회하지 않음
+        other_page = PageFactory.create()
+        other_root = PageCommentFactory.create(page=other_page, depth=0)
+        pages = prefetch_comment_previews(Page.objects.filter(id__in=[page.id, other_page.id]).order_by('id'))
+        self.assertEqual([c.id for c in pages[0].page_comment.all()], [r.id for r in roots[:11]])
+        self.assertEqual([c.id for c in pages[1].page_comment.all()], [other_root.id])
+
+        response = self.client.get(path=self.url_prefix + f"pages/{page.id}", data={"limit": 5})
+        self.assertEqual([c["id"] for c in response.data["page_comments"]], [r.id for r in roots[:5]])
+        self.assertIsNotNone(response.data["next_cursor"])
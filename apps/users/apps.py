@@ -1,5 +1,5 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 
 
 class UsersConfig(AppConfig):
@@ -7,6 +7,9 @@ class UsersConfig(AppConfig):
     name = 'apps.users'
 
     def ready(self):
-        from api.users.signals import save_auth_id
+        from api.users.signals import save_auth_id, invalidate_user, add_user_identity
         from apps.users.models import User
         post_save.connect(save_auth_id, User)
+        post_save.connect(invalidate_user, User)
+        post_delete.connect(invalidate_user, User)
+        post_save.connect(add_user_identity, User)
@@ -0,0 +1,85 @@
+import logging
+import random
+import threading
+
+from django.db import close_old_connections
+from django.db.models.functions import Lower
+
+from utils.cache import (
+    acquire_user_identity_build,
+    add_user_identities,
+    filter_user_identities,
+    mark_user_identities_ready,
+)
+from utils.logging_utils import BraceStyleAdapter
+
+log = BraceStyleAdapter(logging.getLogger("apps.users.availability"))
+
+NICKNAME_SUGGESTION_COUNT = 5
+NICKNAME_SUGGESTION_CANDIDATES = 20
+NICKNAME_SUGGESTION_SUFFIX = 999
+
+
+def get_taken_values(field, values):
+    """
+    이미 사용 중인 이메일/닉네임(소문자)을 return 합니다.
+    redis set에 없는 값은 DB를 조회하지 않고, 나머지는 lower(field) index를 사용하는 IN query 한 번으로 확인합니다.
+    """
+    from apps.users.models import User
+
+    values = list(dict.fromkeys(value.lower() for value in values))
+    candidates = filter_user_identities(field, values)
+    if candidates is None:
+        start_user_identity_build(field)
+        candidates = values
+    if not candidates:
+        return set()
+
+    return set(
+        User.objects.annotate(lower_value=Lower(field))
+        .filter(lower_value__in=candidates)
+        .values_list('lower_value', flat=True)
+    )
+
+
+def is_available(field, value):
+    return value.lower() not in get_taken_values(field, [value])
+
+
+def suggest_nicknames(nickname, count=NICKNAME_SUGGESTION_COUNT):
+    # 후보를 한 번에 만들고 사용 중인 후보를 제외해 count 개까지 return
+    from apps.users.models import User
+
+    max_length = User._meta.get_field('nickname').max_length
+    base = nickname[:max_length - len(str(NICKNAME_SUGGESTION_SUFFIX))]
+    suffixes = random.sample(range(1, NICKNAME_SUGGESTION_SUFFIX + 1), NICKNAME_SUGGESTION_CANDIDATES)
+    candidates = [f'{base}{suffix}' for suffix in suffixes]
+
+    taken = get_taken_values('nickname', candidates)
+    return [candidate for candidate in candidates if candidate.lower() not in taken][:count]
+
+
+def build_user_identity_set(field):
+    from apps.users.models import User
+
+    close_old_connections()
+    try:
+        values = User.objects.annotate(lower_value=Lower(field)).values_list('lower_value', flat=True)
+        chunk = []
+        for value in values.iterator(chunk_size=5000):
+            chunk.append(value)
+            if len(chunk) >= 5000:
+                add_user_identities(field, chunk)
+                chunk = []
+        add_user_identities(field, chunk)
+        mark_user_identities_ready(field)
+    except Exception as e:
+        log.error("user identity set build failed ({}): {}", field, e)
+    finally:
+        close_old_connections()
+
+
+def start_user_identity_build(field):
+    # set이 준비되기 전까지는 DB로만 확인하고, 한 worker가 background에서 set을 채움
+    if acquire_user_identity_build(field):
+        threading.Thread(target=build_user_identity_set, args=(field,), daemon=True).start()
@@ -0,0 +1,154 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.db import close_old_connections, connection, transaction
+
+from utils.logging_utils import BraceStyleAdapter
+
+log = BraceStyleAdapter(logging.getLogger("apps.users.login_logs"))
+
+LOGIN_LOG_QUEUE_SIZE = 10000
+LOGIN_LOG_BATCH_SIZE = 100
+LOGIN_LOG_FLUSH_INTERVAL = 0.5
+
+_queue = queue.Queue(maxsize=LOGIN_LOG_QUEUE_SIZE)
+_dropped = 0
+_dropped_lock = threading.Lock()
+
+
+def write_login_logs(records):
+    """
+    UserLoginLog는 APIRequestLog를 상속한 multi-table model이라 bulk_create를 사용할 수 없으므로,
+    부모(APIRequestLog) row를 bulk_create 한 뒤 반환된 pk로 자식 row를 한 번의 executemany INSERT로 추가합니다.
+    """
+    from apps.users.models import UserLoginLog
+    from rest_framework_tracking.models import APIRequestLog
+
+    logs = [UserLoginLog(**record) for record in records]
+    with transaction.atomic():
+        if not connection.features.can_return_rows_from_bulk_insert:
+            for login_log in logs:
+                login_log.save()
+            return len(logs)
+
+        parents = APIRequestLog.objects.bulk_create([
+            APIRequestLog(**{field.attname: getattr(login_log, field.attname)
+                             for field in APIRequestLog._meta.concrete_fields})
+            for login_log in logs
+        ])
+        for login_log, parent in zip(logs, parents):
+            login_log.id = login_log.apirequestlog_ptr_id = parent.pk
+        insert_child_rows(UserLoginLog, logs)
+    return len(logs)
+
+
+def insert_child_rows(model, objs):
+    # 자식 table의 local field만 insert (auto_now 등은 pre_save로 값을 채움)
+    fields = model._meta.local_concrete_fields
+    quote_name = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote_name(model._meta.db_table),
+        ', '.join(quote_name(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields))
+    )
+    rows = [
+        [field.get_db_prep_save(field.pre_save(obj, True), connection) for field in fields]
+        for obj in objs
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+class LoginLogWriter(threading.Thread):
+    def __init__(self, batch_size=LOGIN_LOG_BATCH_SIZE, interval=LOGIN_LOG_FLUSH_INTERVAL):
+        super().__init__(name='login-log-writer', daemon=True)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            batch = self.collect()
+            if batch:
+                self.write(batch)
+
+    def collect(self):
+        # batch_size 만큼 모이거나 interval이 지나면 flush
+        batch, deadline = [], time.monotonic() + self.interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(_queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def write(self, batch):
+        close_old_connections()
+        try:
+            write_login_logs(batch)
+        except Exception as e:
+            log.error("login log write failed ({} records): {}", len(batch), e)
+            count_dropped(len(batch))
+        finally:
+            close_old_connections()
+
+    def stop(self):
+        # worker 종료 시 queue에 남아있는 기록을 저장
+        self.stopped.set()
+        self.join(self.interval * 2)
+        batch = []
+        while True:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self.write(batch)
+                batch = []
+        if batch:
+            self.write(batch)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def start_login_log_writer():
+    # gunicorn worker fork 이후 첫 로그인 시점에 process 별로 한 번만 시작
+    global _writer
+    if _writer is not None:
+        return _writer
+
+    with _writer_lock:
+        if _writer is None:
+            _writer = LoginLogWriter()
+            _writer.start()
+            atexit.register(_writer.stop)
+    return _writer
+
+
+def count_dropped(n):
+    global _dropped
+    with _dropped_lock:
+        _dropped += n
+        return _dropped
+
+
+def get_dropped_count():
+    return _dropped
+
+
+def enqueue_login_log(record):
+    # queue가 가득 찬 경우 요청을 지연시키지 않고 기록을 버림
+    try:
+        _queue.put_nowait(dict(record))
+    except queue.Full:
+        dropped = count_dropped(1)
+        log.warning("login log queue full, dropped={}", dropped)
+    start_login_log_writer()
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from utils.blacklist import token_blacklist
+
+
+class Command(BaseCommand):
+    help = 'token_blacklist table에 등록된 만료 전 refresh token의 jti를 redis blacklist로 옮깁니다.'
+
+    def handle(self, *args, **options):
+        tokens = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())\
+            .values_list('token__jti', 'token__expires_at')
+
+        imported = 0
+        for jti, expires_at in tokens.iterator(chunk_size=1000):
+            token_blacklist.add(jti, expires_at.timestamp())
+            imported += 1
+
+        self.stdout.write(f'{imported} blacklisted tokens imported')
@@ -0,0 +1,53 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+class Command(BaseCommand):
+    help = '만료된 refresh token(OutstandingToken, BlacklistedToken)을 batch 단위로 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='transaction 하나에서 삭제할 token 수')
+        parser.add_argument('--sleep', type=float, default=0.1, help='batch 사이 대기 시간(초)')
+        parser.add_argument('--loop', type=float, default=None, help='지정한 간격(초)마다 반복 실행합니다.')
+        parser.add_argument('--nice', type=int, default=10, help='process 우선순위(os.nice) 증가 값')
+
+    def handle(self, *args, **options):
+        if options['nice']:
+            os.nice(options['nice'])
+
+        while True:
+            self.prune(options['batch_size'], options['sleep'])
+            if options['loop'] is None:
+                break
+            time.sleep(options['loop'])
+
+    def prune(self, batch_size, sleep):
+        now = timezone.now()
+        started, removed, last_id = time.monotonic(), 0, 0
+
+        while True:
+            # id 순으로 batch를 나눠 짧은 transaction으로 삭제 (BlacklistedToken은 cascade)
+            ids = list(
+                OutstandingToken.objects.filter(id__gt=last_id, expires_at__lt=now)
+                .order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            with transaction.atomic():
+                deleted, _ = OutstandingToken.objects.filter(id__in=ids).delete()
+            removed += deleted
+            last_id = ids[-1]
+
+            if sleep:
+                time.sleep(sleep)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(f'{removed} rows removed in {elapsed:.1f}s ({removed / max(elapsed, 1e-3):.0f} rows/s)')
+        return removed
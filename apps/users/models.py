@@ -1,10 +1,12 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser, UserManager
 from rest_framework_tracking.models import APIRequestLog
 
 from apps.users.choices import SocialAccountTypeEnum
 from core.models import TimeStampModel
 from core.validators import domain_allowlist, SpecificEmailDomainValidator, CategoryDictValidator
+from utils.passwords import password_hashing_pool
 
 
 category_choices = [
@@ -33,7 +35,7 @@ class NewUserManager(UserManager):
             raise ValueError("이메일은 설정되어야 합니다")
         email = self.normalize_email(email)
         user = self.model(nickname=nickname, email=email, **extra_fields)
-        user.set_password(password)
+        password_hashing_pool.run(user.set_password, password)
         user.save(using=self._db)
         return user
 
@@ -92,6 +94,10 @@ class User(AbstractUser, TimeStampModel):
         verbose_name = '사용자'
         verbose_name_plural = verbose_name
         ordering = ['created_at']
+        indexes = [
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+            models.Index(Lower('nickname'), name='user_nickname_lower_idx'),
+        ]
 
     @property
     def social_auth_id(self):
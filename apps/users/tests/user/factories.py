@@ -16,6 +16,7 @@ class UserFactory(factory.django.DjangoModelFactory):
         django_get_or_create = ['nickname', 'email']
 
     nickname = fuzzy.FuzzyText(length=10)
+    auth_id = factory.Sequence(lambda n: f'test_{n}')
     password = make_password('password')
     profile_image = Faker().image_url()
     created_at = timezone.now()
@@ -1,13 +1,39 @@
 
+import hashlib
 import random
+import threading
+import time
+from io import StringIO
+from datetime import timedelta
 from typing import Union
 
-from rest_framework import status
-from rest_framework.test import APIClient, APITestCase
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
 
-from apps.users.models import category_choices
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APITestCase, APIRequestFactory
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.availability import is_available, suggest_nicknames
+from apps.users.login_logs import write_login_logs
+from apps.users.models import UserLoginLog, category_choices
 from .factories import UserFactory
-from core.serializers import ScribbleTokenObtainPairSerializer
+from core.serializers import ScribbleTokenObtainPairSerializer, ScribbleTokenRefreshSerializer
+from core.exceptions import PasswordHashingOverloaded
+from core.tokens import ScribbleRefreshToken
+from scribble.authentication import CustomJWTAuthentication, validated_token_cache
+from utils.blacklist import BloomFilter
+from utils.cache import TOKEN_IP_MAX_DEVICES, get_or_set_token_cache
+from utils.exceptions import custom_exception_handler
+from utils.metrics import get_metrics
+from utils.passwords import PasswordHashingPool
 
 
 class UserTestCase(APITestCase):
@@ -70,6 +96,29 @@ class UserVerifyTestCase(UserTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, {})
 
+    def test_given_shared_email_and_one_user_deleted_expect_email_still_taken(self):
+        other = UserFactory.create(email=self.user.email.upper())
+        other.delete()
+
+        self.assertFalse(is_available('email', self.user.email))
+        response = self.client.get(path=self.verify_email_url + self.user.email)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_given_exist_nickname_expect_free_recommends_in_single_query(self):
+        random.seed(0)
+        candidates = [f'{self.user.nickname}{suffix}' for suffix in random.sample(range(1, 1000), 20)]
+        for nickname in candidates[:10]:
+            UserFactory.create(nickname=nickname.upper())
+
+        random.seed(0)
+        with self.assertNumQueries(1):
+            recommends = suggest_nicknames(self.user.nickname)
+        self.assertEqual(recommends, candidates[10:15])
+        self.assertTrue(all(is_available('nickname', nickname) for nickname in recommends))
+
+        response = self.client.get(path=self.verify_nickname_url + self.user.nickname.upper())
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_given_exist_email_expect_user_verify_fail(self):
         query_url = self.verify_email_url + str(self.user.email)
 
@@ -354,3 +403,234 @@ class UserCategoryTestCase(UserTestCase):
             self.assertTrue(data[0] not in list(response.data['user']['category'].values()))
         else:
             self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class UserAuthenticationCacheTestCase(UserTestCase):
+    def get_request(self):
+        return APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {self.access}')
+
+    def test_given_cached_user_expect_authentication_without_query(self):
+        CustomJWTAuthentication().authenticate(self.get_request())
+        with self.assertNumQueries(0):
+            user, _ = CustomJWTAuthentication().authenticate(self.get_request())
+        self.assertEqual(user.id, self.user.id)
+
+    def test_given_edited_or_deleted_user_expect_authentication_cache_invalidated(self):
+        CustomJWTAuthentication().authenticate(self.get_request())
+        self.user.nickname = 'edited'
+        self.user.save()
+
+        user, _ = CustomJWTAuthentication().authenticate(self.get_request())
+        self.assertEqual(user.nickname, 'edited')
+
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            CustomJWTAuthentication().authenticate(self.get_request())
+
+    def test_given_same_request_expect_single_authentication_pass(self):
+        request = self.get_request()
+        with self.assertNumQueries(1):
+            middleware_user, _ = CustomJWTAuthentication().authenticate(request)
+            drf_user, _ = CustomJWTAuthentication().authenticate(Request(request))
+        self.assertIs(middleware_user, drf_user)
+
+    def test_given_same_access_token_expect_validated_token_cache_hit(self):
+        validated_token_cache.clear()
+        auth = CustomJWTAuthentication()
+        first = auth.get_validated_token(self.access)
+        second = auth.get_validated_token(self.access)
+
+        self.assertIs(first, second)
+        self.assertEqual(validated_token_cache.stats(), {'size': 1, 'hits': 1, 'misses': 1})
+
+    def test_given_malformed_or_expired_token_expect_authentication_fail(self):
+        auth = CustomJWTAuthentication()
+        with self.assertRaises(AuthenticationFailed):
+            auth.get_validated_token(self.access[:-2])
+
+        token = AccessToken.for_user(self.user)
+        token.set_exp(lifetime=timedelta(seconds=-1))
+        with self.assertRaises(AuthenticationFailed):
+            auth.get_validated_token(str(token))
+
+    def test_given_cached_token_past_exp_expect_revalidated(self):
+        digest = hashlib.sha256(self.access.encode('utf-8')).digest()
+        validated_token_cache.set(digest, None, expires_at=time.time() - 1)
+
+        token = CustomJWTAuthentication().get_validated_token(self.access)
+        self.assertEqual(token['user_id'], self.user.id)
+
+
+@override_settings(TOKEN_BLACKLIST_BACKEND='cache')
+class UserTokenBlacklistTestCase(UserTestCase):
+    def test_given_issued_token_expect_no_outstanding_token_row(self):
+        self.assertFalse(OutstandingToken.objects.exists())
+
+    def test_given_rotated_refresh_token_expect_blacklisted_without_query(self):
+        with self.assertNumQueries(0):
+            serializer = ScribbleTokenRefreshSerializer(data={'refresh': self.refresh})
+            serializer.is_valid(raise_exception=True)
+
+        with self.assertNumQueries(0), self.assertRaises(TokenError):
+            ScribbleRefreshToken(self.refresh)
+        ScribbleRefreshToken(serializer.validated_data['refresh'])
+
+    def test_given_signout_expect_refresh_token_blacklisted(self):
+        response = self.client.post(path=self.url_prefix + "signout", data={"refresh": self.refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        with self.assertRaises(TokenError):
+            ScribbleRefreshToken(self.refresh)
+
+    def test_given_blacklisted_table_expect_imported_to_cache(self):
+        token = ScribbleRefreshToken(self.refresh)
+        outstanding = OutstandingToken.objects.create(
+            user=self.user, jti=token['jti'], token=self.refresh,
+            expires_at=timezone.now() + timedelta(hours=1)
+        )
+        BlacklistedToken.objects.create(token=outstanding)
+
+        out = StringIO()
+        call_command('import_token_blacklist', stdout=out)
+        self.assertIn('1 blacklisted tokens imported', out.getvalue())
+        with self.assertRaises(TokenError):
+            ScribbleRefreshToken(self.refresh)
+
+    def test_bloom_filter_membership(self):
+        bloom = BloomFilter(capacity=100, error_rate=0.01)
+        bloom.add('revoked')
+        self.assertIn('revoked', bloom)
+        self.assertNotIn('valid', bloom)
+
+
+class UserTokenPruneTestCase(UserTestCase):
+    def test_given_expired_tokens_expect_pruned_in_batches(self):
+        now = timezone.now()
+        for i in range(5):
+            expires_at = now + timedelta(hours=1 if i == 4 else -1)
+            token = OutstandingToken.objects.create(user=self.user, jti=f'jti-{i}', token='', expires_at=expires_at)
+            if i % 2:
+                BlacklistedToken.objects.create(token=token)
+
+        out = StringIO()
+        call_command('prune_expired_tokens', '--batch-size', '2', '--sleep', '0', '--nice', '0', stdout=out)
+
+        self.assertIn('6 rows removed', out.getvalue())
+        self.assertEqual(list(OutstandingToken.objects.filter(jti__startswith='jti-').values_list('jti', flat=True)), ['jti-4'])
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+
+class PasswordHashingPoolTestCase(APITestCase):
+    def test_given_full_queue_expect_503_with_retry_after(self):
+        pool = PasswordHashingPool(max_workers=1, queue_size=0)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_hash():
+            started.set()
+            release.wait(5)
+            return True
+
+        worker = threading.Thread(target=pool.run, args=(blocking_hash,))
+        worker.start()
+        started.wait(5)
+        try:
+            with self.assertRaises(PasswordHashingOverloaded) as ctx:
+                pool.run(lambda: True)
+        finally:
+            release.set()
+            worker.join()
+
+        self.assertEqual(pool.stats(), {'queue_depth': 0, 'rejected': 1})
+        self.assertTrue(pool.run(lambda: True))
+
+        response = custom_exception_handler(ctx.exception, {})
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+
+
+    def test_given_default_pool_expect_rejected_before_all_request_threads_busy(self):
+        pool = PasswordHashingPool()
+        self.assertLess(pool.capacity, settings.GUNICORN_THREADS)
+
+        release = threading.Event()
+        workers = [threading.Thread(target=pool.run, args=(release.wait, 5)) for _ in range(pool.capacity)]
+        for worker in workers:
+            worker.start()
+        try:
+            deadline = time.monotonic() + 5
+            while pool.stats()['queue_depth'] < pool.capacity and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # hashing 대기 중인 thread 외에 request thread가 남아있는 상태에서 거절
+            with self.assertRaises(PasswordHashingOverloaded):
+                pool.run(lambda: True)
+        finally:
+            release.set()
+            for worker in workers:
+                worker.join()
+
+
+class MetricsViewTestCase(UserTestCase):
+    def test_given_password_hashing_expect_metrics_for_staff_only(self):
+        before = get_metrics()['counters'].get('password_hashing.count', 0)
+        PasswordHashingPool().run(lambda: True)
+
+        response = self.client.get(path="http://127.0.0.1:8000/v1/metrics")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(path="http://127.0.0.1:8000/v1/metrics")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['counters']['password_hashing.count'], before + 1)
+        gauges = list(response.data['gauges'].values())[0]
+        self.assertEqual(gauges['password_hashing.queue_depth'], 0)
+
+
+class UserLoginLogTestCase(UserTestCase):
+    def test_given_login_records_expect_written_in_batch(self):
+        records = [
+            {
+                'user': self.user,
+                'requested_at': timezone.now(),
+                'path': '/v1/users/signin',
+                'remote_addr': '127.0.0.1',
+                'host': 'testserver',
+                'method': 'POST',
+                'user_agent': f'agent-{i}',
+            }
+            for i in range(3)
+        ]
+
+        self.assertEqual(write_login_logs(records), 3)
+        self.assertEqual(
+            list(UserLoginLog.objects.order_by('id').values_list('user_agent', 'user_id')),
+            [(f'agent-{i}', self.user.id) for i in range(3)]
+        )
+
+
+class UserTokenIpBindingTestCase(UserTestCase):
+    def setUp(self):
+        super(UserTokenIpBindingTestCase, self).setUp()
+        caches['default'].clear()
+        self.refresh_url = "http://127.0.0.1:8000/v1/token/refresh"
+
+    def get_request(self, remote_addr):
+        return APIRequestFactory().post('/', REMOTE_ADDR=remote_addr)
+
+    def test_given_bound_devices_expect_only_bound_ip_allowed(self):
+        for i in range(TOKEN_IP_MAX_DEVICES + 1):
+            get_or_set_token_cache(self.get_request(f'10.0.0.{i}'), self.user.id, bind=True)
+
+        self.assertEqual(get_or_set_token_cache(self.get_request('10.0.0.1'), self.user.id), (True, "success"))
+        self.assertEqual(get_or_set_token_cache(self.get_request('10.0.0.0'), self.user.id), (False, "invalid_ip"))
+        self.assertEqual(get_or_set_token_cache(self.get_request('10.0.0.1'), self.admin.id), (False, "ip_does_not_exist"))
+
+    def test_given_signin_expect_token_refresh_from_same_ip_only(self):
+        data = {"email": str(self.user.email), "password": "password"}
+        response = self.client.post(path=self.url_prefix + "signin", data=data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.post(path=self.refresh_url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.post(path=self.refresh_url, REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
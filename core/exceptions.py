@@ -26,3 +26,10 @@ class PageCommentNotFound(APIException):
     status_code = status.HTTP_404_NOT_FOUND
     default_detail = _('no_exist_page_comment')
     default_code = 'not_found'
+
+
+class PasswordHashingOverloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('password_hashing_overloaded')
+    default_code = 'service_unavailable'
+    wait = 1
@@ -1,6 +1,14 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
 from collections import OrderedDict
 
-from rest_framework.pagination import LimitOffsetPagination
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import LimitOffsetPagination, BasePagination, _positive_int
 from rest_framework.response import Response
 
 
@@ -30,3 +38,142 @@ class MainViewPagination(LimitOffsetPagination):
         response.update(kwargs)
 
         return Response(response)
+
+
+class UserMainViewPagination(MainViewPagination):
+    default_limit = 10
+    max_limit = 100
+
+
+class NoteListPagination(MainViewPagination):
+    default_limit = 100
+    max_limit = 1000
+    data_key = 'notes'
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    (정렬 key, id) 조합을 기준으로 하는 keyset pagination.
+    LIMIT/OFFSET, COUNT(*) 없이 마지막으로 조회한 row 다음부터 조회하므로 조회 깊이와 관계없이 일정한 비용이 듭니다.
+    cursor는 정렬 기준과 위치를 담은 불투명한 문자열이며, 정렬 기준이 다른 cursor는 거부합니다.
+    """
+    page_size = 4
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+    ordering = ('-created_at', '-id')
+    data_key = 'results'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(view)
+        self.model = queryset.model
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['reverse'])
+        ordering = tuple(self._invert(field) for field in self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(self.get_keyset_filter(ordering, cursor['position']))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = cursor is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, 'ordering', None) or self.ordering)
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith('-') else '-' + field
+
+    @staticmethod
+    def get_keyset_filter(ordering, position):
+        # (a, b) < (a0, b0)  ==>  a < a0 OR (a = a0 AND b < b0)
+        keyset_filter = Q()
+        for i, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition = Q(**{f'{name}__{lookup}': position[i]})
+            for prev_field, prev_value in zip(ordering[:i], position[:i]):
+                condition &= Q(**{prev_field.lstrip('-'): prev_value})
+            keyset_filter |= condition
+        return keyset_filter
+
+    def get_position(self, instance):
+        # DjangoJSONEncoder는 datetime을 millisecond 단위로 자르므로 isoformat을 그대로 사용
+        position = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip('-'))
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return position
+
+    def encode_cursor(self, instance, reverse):
+        data = {'o': self.ordering, 'p': self.get_position(instance), 'r': reverse}
+        return b64encode(json.dumps(data).encode('utf-8'), altchars=b'-_').decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            data = json.loads(b64decode(encoded.encode('ascii'), altchars=b'-_'))
+            if tuple(data['o']) != self.ordering or len(data['p']) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, data['p'])
+            ]
+            return {'position': position, 'reverse': bool(data['r'])}
+        except (BinasciiError, UnicodeError, ValueError, KeyError, TypeError,
+                FieldDoesNotExist, DjangoValidationError):
+            raise ValidationError(detail=_("invalid_cursor"))
+
+    def get_next_cursor(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_cursor(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data, **kwargs):
+        response = OrderedDict([
+            ('previous_cursor', self.get_previous_cursor()),
+            ('next_cursor', self.get_next_cursor()),
+            (self.data_key, data)
+        ])
+        response.update(kwargs)
+
+        return Response(response)
+
+
+class MainViewCursorPagination(KeysetCursorPagination):
+    page_size = 4
+
+
+class PageCommentCursorPagination(KeysetCursorPagination):
+    page_size = 10
+    ordering = ('created_at', 'id')
+    data_key = 'page_comments'
@@ -1,14 +1,18 @@
 from datetime import datetime
 
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 from rest_framework import serializers
 
+from core.tokens import ScribbleRefreshToken
+
 
 class StringListField(serializers.ListField):
     child = serializers.CharField()
 
 
 class ScribbleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = ScribbleRefreshToken
+
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
@@ -16,3 +20,7 @@ class ScribbleTokenObtainPairSerializer(TokenObtainPairSerializer):
         token["username"] = user.nickname
 
         return token
+
+
+class ScribbleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = ScribbleRefreshToken
@@ -1,7 +1,40 @@
 from rest_framework.throttling import SimpleRateThrottle
 
+from utils.cache import consume_token_bucket, get_redis_client
 
-class AnonRateThrottle(SimpleRateThrottle):
+
+class RedisRateThrottle(SimpleRateThrottle):
+    """
+    redis token bucket으로 요청 수를 제한합니다.
+    SimpleRateThrottle처럼 요청 시각 목록을 cache에 다시 쓰지 않고 script 한 번으로 확인합니다.
+    django_redis backend가 아닌 경우(dev: LocMemCache) SimpleRateThrottle과 같이 동작합니다.
+    """
+    wait_seconds = None
+
+    def allow_request(self, request, view):
+        client = get_redis_client()
+        if client is None:
+            return super().allow_request(request, view)
+
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self.wait_seconds = consume_token_bucket(
+            client, self.key, self.num_requests, self.duration, self.timer()
+        )
+        return allowed
+
+    def wait(self):
+        if self.wait_seconds is not None:
+            return self.wait_seconds
+        return super().wait()
+
+
+class AnonRateThrottle(RedisRateThrottle):
     scope = 'anon'
 
     def get_cache_key(self, request, view):
@@ -13,3 +46,16 @@ class AnonRateThrottle(SimpleRateThrottle):
         }
 
 
+class UserRateThrottle(RedisRateThrottle):
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': ident
+        }
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken
+
+from utils.blacklist import token_blacklist
+
+
+def use_cache_blacklist():
+    return getattr(settings, 'TOKEN_BLACKLIST_BACKEND', 'database') == 'cache'
+
+
+class ScribbleRefreshToken(RefreshToken):
+    """
+    TOKEN_BLACKLIST_BACKEND = 'cache' 인 경우 token_blacklist app의 table 대신 redis에 폐기된 jti를 저장합니다.
+    기존 table에 등록된 jti는 import_token_blacklist command로 옮긴 뒤 전환합니다.
+    """
+    def check_blacklist(self):
+        if not use_cache_blacklist():
+            return super().check_blacklist()
+
+        if token_blacklist.contains(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        if not use_cache_blacklist():
+            return super().blacklist()
+
+        token_blacklist.add(self.payload[api_settings.JTI_CLAIM], self.payload['exp'])
+
+    @classmethod
+    def for_user(cls, user):
+        if not use_cache_blacklist():
+            return super().for_user(user)
+
+        # 발급 token(OutstandingToken)을 DB에 기록하지 않음
+        return super(BlacklistMixin, cls).for_user(user)
@@ -1,24 +1,41 @@
 from drf_yasg.utils import swagger_auto_schema, no_body
 
 from rest_framework import generics, status
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.views import TokenViewBase
-from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from django.conf import settings
 
 from core.pagination import MainViewPagination
-from core.serializers import ScribbleTokenObtainPairSerializer
+from core.serializers import ScribbleTokenObtainPairSerializer, ScribbleTokenRefreshSerializer
 from utils.cache import get_or_set_token_cache
+from utils.metrics import get_metrics
 from utils.swagger import swagger_response, swagger_schema_with_properties, swagger_schema_with_description
-from scribble.settings.base import RUN_ENV
 
 
 class TemplateMainView(generics.ListAPIView):
     pagination_class = MainViewPagination
+    cursor_pagination_class = None
+    data_key = 'results'
+
+    @property
+    def paginator(self):
+        # cursor query parameter가 전달된 경우(첫 페이지는 빈 값) keyset pagination 사용
+        if not hasattr(self, '_paginator'):
+            pagination_class = self.pagination_class
+            cursor_class = self.cursor_pagination_class
+            if cursor_class and cursor_class.cursor_query_param in self.request.query_params:
+                pagination_class = cursor_class
+            self._paginator = pagination_class() if pagination_class else None
+            if self._paginator is not None:
+                self._paginator.data_key = self.data_key
+        return self._paginator
 
     def get_paginated_data(self, queryset):
         pagination = self.paginate_queryset(queryset)
-        serializer = self.serializer_class(instance=pagination or queryset, many=True)
+        serializer = self.serializer_class(instance=queryset if pagination is None else pagination, many=True)
         return serializer.data
 
 
@@ -34,8 +51,7 @@ class ScribbleTokenObtainView(generics.CreateAPIView):
         if response.status_code >= 400:
             return response
 
-        if RUN_ENV == "prod":
-            cached, msg = get_or_set_token_cache(request=request, user=self.user)
+        get_or_set_token_cache(request=request, user_id=self.user.id, bind=True)
 
         token = self.serializer_class.get_token(self.user)
         response.data['access'] = str(token.access_token)
@@ -51,7 +67,7 @@ class ScribbleTokenObtainView(generics.CreateAPIView):
 
 
 class ScribbleTokenRefreshView(TokenViewBase):
-    serializer_class = TokenRefreshSerializer
+    serializer_class = ScribbleTokenRefreshSerializer
 
     @swagger_auto_schema(
         operation_id='token_refresh',
@@ -67,12 +83,17 @@ class ScribbleTokenRefreshView(TokenViewBase):
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
 
+        # 방금 발급한 access token이므로 서명 검증 없이 user id만 확인
+        access = AccessToken(serializer.validated_data['access'], verify=False)
+        self.user_id = access[api_settings.USER_ID_CLAIM]
         return Response(serializer.validated_data, status=status.HTTP_201_CREATED)
 
     def finalize_response(self, request, response, *args, **kwargs):
         super(ScribbleTokenRefreshView, self).finalize_response(request, response, *args, **kwargs)
+        if response.status_code >= 400:
+            return response
 
-        cached, msg = get_or_set_token_cache(request=request, user=request.user)
+        cached, msg = get_or_set_token_cache(request=request, user_id=self.user_id)
         if cached is False:
             response.status_code = 401
             return response
@@ -88,3 +109,16 @@ class ScribbleTokenRefreshView(TokenViewBase):
 
         return response
 
+
+class MetricsView(generics.GenericAPIView):
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_id='metrics',
+        operation_description='모든 worker에서 누적된 counter와 worker 별 gauge를 조회합니다. (관리자 전용)',
+        responses={
+            200: swagger_response(description='METRICS_200')
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(get_metrics(), status=status.HTTP_200_OK)
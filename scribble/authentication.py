@@ -1,3 +1,6 @@
+import hashlib
+import time
+
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 
@@ -6,6 +9,13 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.settings import api_settings
 
+from utils.cache import LRUCache, get_or_set_user_cache
+
+VALIDATED_TOKEN_CACHE_SIZE = 10000
+
+# 검증된 access token을 만료 시각까지 worker 단위로 cache (서명 검증, claim parsing 생략)
+validated_token_cache = LRUCache(maxsize=VALIDATED_TOKEN_CACHE_SIZE)
+
 
 class CustomJWTAuthentication(JWTAuthentication):
     www_authenticate_realm = "api"
@@ -13,6 +23,7 @@ class CustomJWTAuthentication(JWTAuthentication):
 
     access_token, raw_token, validated_token = None, None, None
     user = None
+    result_attr = '_jwt_authentication'
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -32,12 +43,23 @@ class CustomJWTAuthentication(JWTAuthentication):
             return header_content
 
     def get_validated_token(self, raw_token):
+        if isinstance(raw_token, str):
+            raw_token = raw_token.encode('utf-8')
+        digest = hashlib.sha256(raw_token).digest()
+
+        validated_token = validated_token_cache.get(digest, now=time.time())
+        if validated_token is not None:
+            return validated_token
+
         auth_token = api_settings.AUTH_TOKEN_CLASSES[0]
         try:
-            return auth_token(raw_token)
+            validated_token = auth_token(raw_token)
         except TokenError:
             raise AuthenticationFailed(detail=_("token_not_valid"), code="token_not_valid")
 
+        validated_token_cache.set(digest, validated_token, expires_at=validated_token['exp'])
+        return validated_token
+
     def get_user(self, validated_token):
         try:
             user_id = validated_token[api_settings.USER_ID_CLAIM]
@@ -45,7 +67,11 @@ class CustomJWTAuthentication(JWTAuthentication):
             raise AuthenticationFailed(detail=_("token_not_valid"), code="token_not_valid")
 
         try:
-            user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            # password는 cache에 저장하지 않도록 제외하고 조회
+            user = get_or_set_user_cache(
+                user_id,
+                lambda: self.user_model.objects.defer('password').get(**{api_settings.USER_ID_FIELD: user_id})
+            )
         except self.user_model.DoesNotExist:
             raise AuthenticationFailed(detail=_("not_authenticated_user"), code="user_not_found")
         else:
@@ -54,6 +80,21 @@ class CustomJWTAuthentication(JWTAuthentication):
         return user
 
     def authenticate(self, request):
+        # TokenAuthMiddleWare와 DRF 인증이 같은 결과를 사용하도록 django request에 인증 결과(또는 예외)를 저장
+        http_request = getattr(request, '_request', request)
+        result = getattr(http_request, self.result_attr, None)
+        if result is None:
+            try:
+                result = self._authenticate(http_request)
+            except (NotAuthenticated, AuthenticationFailed) as e:
+                result = e
+            setattr(http_request, self.result_attr, result)
+
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _authenticate(self, request):
         header = self.get_header(request)
         if header is None:
             return None, None
@@ -1,6 +1,7 @@
 import importlib
 
 from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
 from django.utils.deprecation import MiddlewareMixin
 from django.utils.functional import SimpleLazyObject
 
@@ -25,13 +26,29 @@ if RUN_ENV == "dev":
     REQ_ALLOWED_PATH.append("/docs")
 
 VERSION = getattr(settings, 'VERSION', '')
-VERSION_ALLOWED_PATH = ['/' + VERSION + path for path in REQ_ALLOWED_PATH]
+VERSION_ALLOWED_PATH = frozenset('/' + VERSION + path for path in REQ_ALLOWED_PATH)
+
+
+def get_renderer_class():
+    attr = getattr(settings, 'REST_FRAMEWORK', None)
+    assert attr
+    m_name, c_name = attr['DEFAULT_RENDERER_CLASSES'][0].rsplit('.', 1)
+    return getattr(importlib.import_module(m_name), c_name) or JSONRenderer
 
 
 class TokenAuthMiddleWare(MiddlewareMixin):
     def __init__(self, get_response):
         super().__init__(get_response)
         self.get_response = get_response
+        self.auth = CustomJWTAuthentication()
+
+        # 미인증 사용자 응답은 서버 시작 시 한 번만 render
+        response = Response({"user": "is_anonymous"}, status=status.HTTP_403_FORBIDDEN)
+        response.accepted_renderer = get_renderer_class()()
+        response.accepted_media_type = "application/json"
+        response.renderer_context = {}
+        response.render()
+        self.anonymous_content, self.anonymous_content_type = response.content, response['Content-Type']
 
     def __call__(self, request):
         self.process_request(request)
@@ -46,23 +63,17 @@ class TokenAuthMiddleWare(MiddlewareMixin):
         request.user = SimpleLazyObject(lambda: self.get_token_user(request))
 
     def process_response(self, request, response):
-        attr = getattr(settings, 'REST_FRAMEWORK', None)
-        assert attr
-        m_name, c_name = attr['DEFAULT_RENDERER_CLASSES'][0].rsplit('.', 1)
-        cls_renderer = getattr(importlib.import_module(m_name), c_name) or JSONRenderer
-
         if request.user.is_anonymous:
-            response = Response({"user": "is_anonymous"}, status=status.HTTP_403_FORBIDDEN)
-            response.accepted_renderer = cls_renderer()
-            response.accepted_media_type = "application/json"
-            response.renderer_context = {}
-            response.render()
+            response = HttpResponse(
+                self.anonymous_content,
+                status=status.HTTP_403_FORBIDDEN,
+                content_type=self.anonymous_content_type
+            )
 
         return response
 
-    @staticmethod
-    def get_token_user(request):
-        auth = CustomJWTAuthentication()
-        user, jwt_token = auth.authenticate(request)
+    def get_token_user(self, request):
+        # 인증 결과는 request에 저장되어 DRF의 CustomJWTAuthentication에서 재사용
+        user, jwt_token = self.auth.authenticate(request)
 
         return user or AnonymousUser()
@@ -21,6 +21,25 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 NAVER_API_CLIENT_ID = os.environ.get('NAVER_API_CLIENT_ID')
 NAVER_API_CLIENT_SECRET = os.environ.get('NAVER_API_CLIENT_SECRET')
 
+# 네이버 도서 검색 결과 cache (초 단위 TTL, 결과가 없는 검색은 EMPTY_TIMEOUT 동안 유지)
+# 만료된 결과는 STALE_TIMEOUT 동안 더 보관하여 네이버 API 장애 시 사용
+NAVER_SEARCH_CACHE = {
+    "ISBN_TIMEOUT": 60 * 60 * 24 * 7,
+    "QUERY_TIMEOUT": 60 * 60,
+    "EMPTY_TIMEOUT": 60 * 5,
+    "STALE_TIMEOUT": 60 * 60 * 24,
+    "LOCAL_CACHE_SIZE": 1000,
+}
+
+# 네이버 검색 API quota (전체 worker 공용)
+# background 호출은 BACKGROUND_RESERVE 비율만큼을 interactive 호출용으로 남겨두고 사용
+NAVER_API_QUOTA = {
+    "PER_SECOND": 10,
+    "DAILY": 25000,
+    "BACKGROUND_RESERVE": 0.3,
+    "MAX_WAIT": {"interactive": 0.5, "background": 5},
+}
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -128,13 +147,19 @@ SIMPLE_JWT = {
     "USER_ID_CLAIM": "user_id",
 
     "TOKEN_OBTAIN_SERIALIZER": "utils.serializers.ScribbleTokenObtainPairSerializer",
-    "TOKEN_REFRESH_SERIALIZER": "rest_framework_simplejwt.serializers.TokenRefreshSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "core.serializers.ScribbleTokenRefreshSerializer",
 
     "AUTH_COOKIE": "SCRIB_TOKEN",
     "AUTH_COOKIE_SECURE": True,
     "AUTH_COOKIE_HTTP_ONLY": True
 }
 
+# gunicorn worker(process) 별 request thread 수 (scripts/start.sh의 --threads)
+GUNICORN_THREADS = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# refresh token blacklist 저장소 ('database': token_blacklist app table, 'cache': redis)
+TOKEN_BLACKLIST_BACKEND = os.environ.get('TOKEN_BLACKLIST_BACKEND', 'database')
+
 SWAGGER_SETTINGS = {
    'SECURITY_DEFINITIONS': {
       'Bearer': {
@@ -11,4 +11,8 @@ echo
 pip3 install -r /app/requirements.txt
 
 echo
-gunicorn --bind 0:8000 --workers 3 --env DJANGO_SETTINGS_MODULE=scribble.settings.base scribble.wsgi:application
+# gthread worker: worker(process) 별로 GUNICORN_THREADS개의 request thread를 사용
+# password hashing 등 오래 걸리는 작업을 기다리는 동안에도 같은 worker의 다른 thread가 요청을 처리
+# (sync worker에서는 hashing 중 worker 전체가 대기하므로 utils/passwords.py의 pool이 worker를 비워주지 못함)
+export GUNICORN_THREADS=${GUNICORN_THREADS:-4}
+gunicorn --bind 0:8000 --workers 3 --worker-class gthread --threads $GUNICORN_THREADS --env DJANGO_SETTINGS_MODULE=scribble.settings.base scribble.wsgi:application
@@ -0,0 +1,165 @@
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+
+from django.core.cache import caches
+from redis.client import PubSub
+
+from utils.cache import get_redis_client
+from utils.logging_utils import BraceStyleAdapter
+
+log = BraceStyleAdapter(logging.getLogger("scribble.blacklist"))
+
+TOKEN_BLACKLIST_KEY = 'jwt:blacklist:{}'
+TOKEN_BLACKLIST_CHANNEL = 'jwt:blacklist'
+BLOOM_FILTER_CAPACITY = 100000
+BLOOM_FILTER_ERROR_RATE = 0.001
+BLOOM_FILTER_REBUILD_INTERVAL = 60 * 60
+
+
+class BloomFilter:
+    def __init__(self, capacity=BLOOM_FILTER_CAPACITY, error_rate=BLOOM_FILTER_ERROR_RATE):
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # double hashing: h1 + i * h2
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class BlacklistPubSub(PubSub):
+    def __init__(self, blacklist, *args, **kwargs):
+        self.blacklist = blacklist
+        super().__init__(*args, **kwargs)
+
+    def on_connect(self, connection):
+        # 재연결 시 호출되며, 끊긴 동안의 message는 유실되므로 filter를 무효화
+        super().on_connect(connection)
+        with self.blacklist._lock:
+            self.blacklist.invalidate_bloom_filter()
+
+
+class TokenBlacklist:
+    """
+    폐기된 refresh token의 jti를 남은 유효기간만큼의 TTL로 cache(redis)에 저장합니다.
+    process 내 bloom filter에 없는 jti는 redis 조회 없이 통과시키며,
+    다른 worker에서 폐기된 jti는 pub/sub channel로 전달받아 filter에 추가합니다.
+    filter가 준비되지 않았거나 구독이 끊긴 동안에는 항상 redis를 조회합니다.
+    """
+    def __init__(self, alias='default'):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._bloom = None
+        self._building = None
+        self._built_at = 0
+        self._generation = 0
+        self._pubsub_thread = None
+        self._local_bloom = BloomFilter()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def add(self, jti, exp):
+        timeout = int(exp - time.time())
+        if timeout <= 0:
+            return
+
+        client = get_redis_client(self.alias)
+        if client is None:
+            self.cache.set(TOKEN_BLACKLIST_KEY.format(jti), 1, timeout)
+            self._local_bloom.add(jti)
+            return
+
+        pipe = client.pipeline()
+        pipe.set(self.cache.make_key(TOKEN_BLACKLIST_KEY.format(jti)), 1, ex=timeout)
+        pipe.publish(self.cache.make_key(TOKEN_BLACKLIST_CHANNEL), jti)
+        pipe.execute()
+        self._add_to_filters(jti)
+
+    def contains(self, jti):
+        bloom = self.get_bloom_filter()
+        if bloom is not None and jti not in bloom:
+            return False
+        return self.cache.has_key(TOKEN_BLACKLIST_KEY.format(jti))
+
+    def get_bloom_filter(self):
+        client = get_redis_client(self.alias)
+        if client is None:
+            # LocMemCache는 process 단위이므로 local filter가 모든 jti를 포함
+            return self._local_bloom
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            stale = time.monotonic() - self._built_at > BLOOM_FILTER_REBUILD_INTERVAL
+            if (self._bloom is None or stale) and self._building is None:
+                self._building = BloomFilter()
+                threading.Thread(target=self._build, args=(client, self._generation), daemon=True).start()
+            return self._bloom
+
+    def _add_to_filters(self, jti):
+        with self._lock:
+            for bloom in (self._bloom, self._building):
+                if bloom is not None:
+                    bloom.add(jti)
+
+    def _build(self, client, generation):
+        # 구독을 먼저 시작한 뒤 scan 하므로 scan 도중 폐기된 jti도 누락되지 않음
+        bloom = self._building
+        try:
+            if self._pubsub_thread is None:
+                pubsub = BlacklistPubSub(self, client.connection_pool, ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.cache.make_key(TOKEN_BLACKLIST_CHANNEL): self._on_message})
+                self._pubsub_thread = pubsub.run_in_thread(
+                    sleep_time=1, daemon=True, exception_handler=self._on_error
+                )
+
+            pattern = self.cache.make_key(TOKEN_BLACKLIST_KEY.format('*'))
+            for key in client.scan_iter(match=pattern, count=1000):
+                bloom.add(key.decode('utf-8').rsplit(':', 1)[-1])
+
+            with self._lock:
+                if generation == self._generation:
+                    self._bloom, self._built_at = bloom, time.monotonic()
+        except Exception as e:
+            log.warning("failed to build token blacklist bloom filter: {}", e)
+        finally:
+            with self._lock:
+                self._building = None
+
+    def _on_message(self, message):
+        jti = message['data']
+        self._add_to_filters(jti.decode('utf-8') if isinstance(jti, bytes) else jti)
+
+    def _on_error(self, e, pubsub, thread):
+        log.warning("token blacklist subscription closed: {}", e)
+        thread.stop()
+        with self._lock:
+            self._pubsub_thread = None
+            self.invalidate_bloom_filter()
+
+    def invalidate_bloom_filter(self):
+        # 구독이 끊긴 동안 전달되지 않은 jti가 있을 수 있으므로 filter를 다시 만들 때까지 redis만 조회
+        self._generation += 1
+        self._bloom = None
+
+
+token_blacklist = TokenBlacklist()
@@ -1,23 +1,450 @@
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, defaultdict
+
 from django.core.cache import caches
 
 
 def cache_key_function(key, key_prefix, version):
-    return key_prefix + ":" + str(key)
+    return f"{key_prefix}:{version}:{key}"
 
 
-def get_or_set_token_cache(request, user):
-    # TODO: key_timeout
-    cache = caches['default']
-    key = str(user.id)
+TOKEN_IP_KEY = 'auth:ip:{}'
+TOKEN_IP_MAX_DEVICES = 5
+_token_ip_lock = threading.Lock()
+
+# 사용자별 {ip: 만료 시각} sorted set을 script 하나로 확인/갱신
+# return: 1 = 등록된 ip, 2 = 새로 등록(bind), 0 = 등록된 ip가 없어 새로 등록, -1 = 등록되지 않은 ip
+TOKEN_IP_SCRIPT = """
+local ip, now, expires_at = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+local timeout, bind, max_devices = tonumber(ARGV[4]), ARGV[5] == '1', tonumber(ARGV[6])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+local registered = redis.call('ZSCORE', KEYS[1], ip)
+local count = redis.call('ZCARD', KEYS[1])
+if not registered and not bind and count > 0 then
+    return -1
+end
+
+redis.call('ZADD', KEYS[1], expires_at, ip)
+redis.call('ZREMRANGEBYRANK', KEYS[1], 0, -(max_devices + 1))
+redis.call('EXPIRE', KEYS[1], timeout)
+if registered then
+    return 1
+end
+if count == 0 then
+    return 0
+end
+return 2
+"""
+_token_ip_script = None
+TOKEN_IP_RESULTS = {
+    1: (True, "success"),
+    2: (True, "success"),
+    0: (False, "ip_does_not_exist"),
+    -1: (False, "invalid_ip"),
+}
+
 
-    cache_ip_addr = cache.get(key)
+def get_or_set_token_cache(request, user_id, bind=False):
+    """
+    refresh token을 사용할 수 있는 ip를 사용자별로 최대 TOKEN_IP_MAX_DEVICES개까지 기록합니다.
+    각 ip는 마지막 로그인/재발급 시점부터 REFRESH_TOKEN_LIFETIME 동안 유지되며,
+    bind=True(로그인)인 경우 새 ip를 추가하고, 재발급 시에는 등록된 ip인지 확인합니다.
+    """
+    from django.conf import settings
+
+    global _token_ip_script
+    cache = caches['default']
+    key = TOKEN_IP_KEY.format(user_id)
     remote_addr = request.META.get('REMOTE_ADDR')
+    timeout = int(settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds())
+    now = time.time()
+
+    client = get_redis_client()
+    if client is not None:
+        if _token_ip_script is None:
+            _token_ip_script = client.register_script(TOKEN_IP_SCRIPT)
+        result = _token_ip_script(
+            keys=[cache.make_key(key)],
+            args=[remote_addr, now, now + timeout, timeout, int(bind), TOKEN_IP_MAX_DEVICES],
+            client=client
+        )
+        return TOKEN_IP_RESULTS[int(result)]
+
+    # LocMemCache는 process 단위이므로 lock으로 get/set을 묶음
+    with _token_ip_lock:
+        addrs = {ip: expires_at for ip, expires_at in (cache.get(key) or {}).items() if expires_at > now}
+        registered = remote_addr in addrs
+        if not registered and not bind and addrs:
+            return TOKEN_IP_RESULTS[-1]
+
+        count = len(addrs)
+        addrs[remote_addr] = now + timeout
+        addrs = dict(sorted(addrs.items(), key=lambda item: item[1])[-TOKEN_IP_MAX_DEVICES:])
+        cache.set(key, addrs, timeout)
+    return TOKEN_IP_RESULTS[1 if registered else 0 if count == 0 else 2]
+
+
+MAIN_FEED_KEY = 'main:feed'
+MAIN_FEED_COUNT_KEY = 'main:feed:count'
+MAIN_FEED_FRAGMENT_KEY = 'main:feed:page:{}'
+MAIN_FEED_SIZE = 1000
+MAIN_FEED_TIMEOUT = 60 * 60
+MAIN_FEED_FRAGMENT_TIMEOUT = 60 * 10
+
+
+def get_redis_client(alias='default'):
+    # django_redis backend가 아닌 경우(dev: LocMemCache) None을 return 하고 django cache API로 동작
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection(alias)
+    except (ImportError, NotImplementedError):
+        return None
+
+
+def get_main_feed_snapshot(offset, limit):
+    """
+    메인 화면 최신순 page id snapshot 중 [offset, offset + limit) 구간과 전체 page 수를 return 합니다.
+    snapshot이 없는 경우 None을 return 합니다.
+    """
+    cache = caches['default']
+    client = get_redis_client()
+    if client is None:
+        snapshot = cache.get(MAIN_FEED_KEY)
+        if snapshot is None:
+            return None
+        return snapshot['ids'][offset:offset + limit], len(snapshot['ids']), snapshot['count']
+
+    pipe = client.pipeline()
+    pipe.get(cache.make_key(MAIN_FEED_COUNT_KEY))
+    pipe.lrange(cache.make_key(MAIN_FEED_KEY), offset, offset + limit - 1)
+    pipe.llen(cache.make_key(MAIN_FEED_KEY))
+    count, ids, size = pipe.execute()
+    if count is None:
+        return None
+    return [int(i) for i in ids], size, int(count)
+
+
+def set_main_feed_snapshot(ids, count):
+    cache = caches['default']
+    client = get_redis_client()
+    ids = list(ids)[:MAIN_FEED_SIZE]
+    if client is None:
+        cache.set(MAIN_FEED_KEY, {'ids': ids, 'count': count}, MAIN_FEED_TIMEOUT)
+        return
+
+    # count key가 snapshot 존재 여부를 나타내므로 list를 먼저 채운 뒤 마지막에 기록
+    feed_key, count_key = cache.make_key(MAIN_FEED_KEY), cache.make_key(MAIN_FEED_COUNT_KEY)
+    pipe = client.pipeline()
+    pipe.delete(feed_key)
+    if ids:
+        pipe.rpush(feed_key, *ids)
+        pipe.expire(feed_key, MAIN_FEED_TIMEOUT)
+    pipe.set(count_key, count, ex=MAIN_FEED_TIMEOUT)
+    pipe.execute()
+
+
+def prepend_main_feed(ids):
+    # 새로 등록된 page id를 snapshot 앞에 추가 (snapshot이 없으면 다음 조회 시 재생성)
+    cache = caches['default']
+    client = get_redis_client()
+    ids = sorted(ids)
+    if not ids:
+        return
+    if client is None:
+        snapshot = cache.get(MAIN_FEED_KEY)
+        if snapshot is not None:
+            snapshot['ids'] = (ids[::-1] + snapshot['ids'])[:MAIN_FEED_SIZE]
+            snapshot['count'] += len(ids)
+            cache.set(MAIN_FEED_KEY, snapshot, MAIN_FEED_TIMEOUT)
+        return
+
+    feed_key, count_key = cache.make_key(MAIN_FEED_KEY), cache.make_key(MAIN_FEED_COUNT_KEY)
+    if not client.exists(count_key):
+        return
+    pipe = client.pipeline()
+    pipe.lpush(feed_key, *ids)
+    pipe.ltrim(feed_key, 0, MAIN_FEED_SIZE - 1)
+    pipe.incrby(count_key, len(ids))
+    pipe.execute()
+
+
+def invalidate_main_feed():
+    cache = caches['default']
+    cache.delete_many([MAIN_FEED_COUNT_KEY, MAIN_FEED_KEY])
+
+
+def get_page_fragments(page_ids):
+    cache = caches['default']
+    cached = cache.get_many([MAIN_FEED_FRAGMENT_KEY.format(page_id) for page_id in page_ids])
+    return {
+        page_id: cached[MAIN_FEED_FRAGMENT_KEY.format(page_id)]
+        for page_id in page_ids if MAIN_FEED_FRAGMENT_KEY.format(page_id) in cached
+    }
+
+
+def set_page_fragments(fragments):
+    cache = caches['default']
+    cache.set_many(
+        {MAIN_FEED_FRAGMENT_KEY.format(page_id): data for page_id, data in fragments.items()},
+        MAIN_FEED_FRAGMENT_TIMEOUT
+    )
+
+
+def delete_page_fragments(page_ids):
+    cache = caches['default']
+    cache.delete_many([MAIN_FEED_FRAGMENT_KEY.format(page_id) for page_id in page_ids])
+
+
+HIT_COUNT_KEY = 'hits:{}'
+_hit_counts = defaultdict(Counter)
+_hit_counts_lock = threading.Lock()
+
+
+def incr_hit_count(model_name, pk, value=1):
+    # 조회수 증가분을 redis hash(django_redis가 아닌 경우 process memory)에 누적
+    client = get_redis_client()
+    if client is None:
+        with _hit_counts_lock:
+            _hit_counts[model_name][pk] += value
+        return
+
+    client.hincrby(caches['default'].make_key(HIT_COUNT_KEY.format(model_name)), pk, value)
+
 
-    if cache_ip_addr is None:
-        cache.set(key, remote_addr)
-        return False, "ip_does_not_exist"
+def pop_hit_counts(model_name):
+    """
+    누적된 조회수 증가분({pk: n})을 return 하고 buffer를 비웁니다.
+    redis의 경우 hash를 임시 key로 rename 한 뒤 읽으므로, 여러 worker가 동시에 flush 해도 중복 반영되지 않습니다.
+    """
+    client = get_redis_client()
+    if client is None:
+        with _hit_counts_lock:
+            counts = _hit_counts.pop(model_name, Counter())
+        return dict(counts)
 
-    if cache_ip_addr == remote_addr:
-        return True, "success"
+    from redis.exceptions import ResponseError
 
-    return False, "invalid_ip"
+    key = caches['default'].make_key(HIT_COUNT_KEY.format(model_name))
+    flush_key = f'{key}:flush:{uuid.uuid4().hex}'
+    if not client.exists(key):
+        return {}
+    try:
+        client.rename(key, flush_key)
+    except ResponseError:
+        # exists 확인 이후 다른 worker가 먼저 rename 한 경우
+        return {}
+
+    pipe = client.pipeline()
+    pipe.hgetall(flush_key)
+    pipe.delete(flush_key)
+    counts, _ = pipe.execute()
+    return {int(pk): int(value) for pk, value in counts.items()}
+
+
+USER_CACHE_KEY = 'auth:user:{}'
+USER_CACHE_TIMEOUT = 60 * 5
+
+
+def get_or_set_user_cache(user_id, loader):
+    # 인증된 사용자 객체를 짧은 TTL로 cache (사용자 수정/삭제 시 signal로 invalidate)
+    cache = caches['default']
+    key = USER_CACHE_KEY.format(user_id)
+
+    user = cache.get(key)
+    if user is None:
+        user = loader()
+        cache.set(key, user, USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_user_cache(user_id):
+    caches['default'].delete(USER_CACHE_KEY.format(user_id))
+
+
+class LRUCache:
+    """
+    process 내 크기 제한 LRU cache 입니다. (thread-safe)
+    항목마다 만료 시각(unix timestamp)을 함께 저장하며, 만료된 항목은 조회 시 제거합니다.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, now):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[1] <= now:
+                del self._data[key]
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._data), 'hits': self.hits, 'misses': self.misses}
+
+
+# token bucket: 용량 capacity, 초당 rate 개씩 채워지며 요청마다 1개 소비
+# 여러 worker의 요청을 script 하나(EVALSHA 1회)로 원자적으로 처리 (시각은 worker에서 전달)
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed, wait = 0, 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+
+redis.call('HMSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+_token_bucket_script = None
+
+
+def consume_token_bucket(client, key, capacity, duration, now):
+    """
+    redis token bucket에서 token 1개를 소비합니다.
+    (허용 여부, 다음 token까지 기다려야 하는 초)를 return 합니다.
+    """
+    global _token_bucket_script
+    if _token_bucket_script is None:
+        _token_bucket_script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    allowed, wait = _token_bucket_script(
+        keys=[caches['default'].make_key(key)],
+        args=[capacity, capacity / duration, now],
+        client=client
+    )
+    return bool(allowed), float(wait)
+
+
+USER_IDENTITY_KEY = 'users:{}'
+USER_IDENTITY_READY_KEY = 'users:{}:ready'
+USER_IDENTITY_BUILD_LOCK_KEY = 'users:{}:build'
+USER_IDENTITY_READY_TIMEOUT = 60 * 60 * 24
+
+
+def filter_user_identities(field, values):
+    """
+    이메일/닉네임(소문자) redis set을 확인해 이미 사용 중일 수 있는 값만 return 합니다.
+    set에 없는 값은 사용 가능하며, set이 준비되지 않은 경우(또는 redis가 아닌 경우) None을 return 합니다.
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    cache = caches['default']
+    key = cache.make_key(USER_IDENTITY_KEY.format(field))
+    pipe = client.pipeline()
+    pipe.exists(cache.make_key(USER_IDENTITY_READY_KEY.format(field)))
+    for value in values:
+        pipe.sismember(key, value)
+    ready, *members = pipe.execute()
+    if not ready:
+        return None
+    return [value for value, member in zip(values, members) if member]
+
+
+def add_user_identities(field, values):
+    client = get_redis_client()
+    values = [value.lower() for value in values if value]
+    if client is None or not values:
+        return
+    client.sadd(caches['default'].make_key(USER_IDENTITY_KEY.format(field)), *values)
+
+
+def acquire_user_identity_build(field):
+    # 여러 worker 중 하나만 set을 채우도록 lock
+    client = get_redis_client()
+    if client is None:
+        return False
+    key = caches['default'].make_key(USER_IDENTITY_BUILD_LOCK_KEY.format(field))
+    return bool(client.set(key, 1, nx=True, ex=60))
+
+
+def mark_user_identities_ready(field):
+    client = get_redis_client()
+    key = caches['default'].make_key(USER_IDENTITY_READY_KEY.format(field))
+    client.set(key, 1, ex=USER_IDENTITY_READY_TIMEOUT)
+
+
+# 외부 API quota: 초당 token bucket + 일일 호출 수를 script 하나로 확인
+# reserve_tokens/reserve_daily 만큼은 남겨두고 소비 (우선순위가 낮은 호출용)
+# return: {허용 여부, 대기 시간(초, 일일 quota 소진 시 -1), 남은 token, 남은 일일 호출 수}
+QUOTA_SCRIPT = """
+local capacity, rate, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local daily_limit, reserve_tokens, reserve_daily = tonumber(ARGV[4]), tonumber(ARGV[5]), tonumber(ARGV[6])
+local daily_timeout = tonumber(ARGV[7])
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local used = tonumber(redis.call('GET', KEYS[2]) or '0')
+
+local allowed, wait = 0, 0
+if used >= daily_limit - reserve_daily then
+    wait = -1
+elseif tokens < 1 + reserve_tokens then
+    wait = (1 + reserve_tokens - tokens) / rate
+else
+    tokens = tokens - 1
+    used = redis.call('INCR', KEYS[2])
+    if used == 1 then
+        redis.call('EXPIRE', KEYS[2], daily_timeout)
+    end
+    allowed = 1
+end
+
+redis.call('HMSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait), tostring(tokens), daily_limit - used}
+"""
+_quota_script = None
+
+
+def consume_quota(client, bucket_key, daily_key, capacity, rate, daily_limit,
+                  reserve_tokens=0, reserve_daily=0, daily_timeout=60 * 60 * 48):
+    global _quota_script
+    if _quota_script is None:
+        _quota_script = client.register_script(QUOTA_SCRIPT)
+
+    cache = caches['default']
+    allowed, wait, tokens, daily_remaining = _quota_script(
+        keys=[cache.make_key(bucket_key), cache.make_key(daily_key)],
+        args=[capacity, rate, time.time(), daily_limit, reserve_tokens, reserve_daily, daily_timeout],
+        client=client
+    )
+    return bool(allowed), float(wait), float(tokens), int(daily_remaining)
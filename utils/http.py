@@ -0,0 +1,144 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import urllib3
+from urllib3.exceptions import HTTPError
+
+from utils.logging_utils import BraceStyleAdapter
+
+log = BraceStyleAdapter(logging.getLogger("scribble.http"))
+
+HTTP_CONNECT_TIMEOUT = 2.0
+HTTP_READ_TIMEOUT = 5.0
+HTTP_RETRIES = 2
+HTTP_RETRY_BACKOFF = 0.2
+HTTP_RETRY_STATUSES = frozenset({502, 503, 504})
+HTTP_POOL_SIZE = 10
+
+
+class OutboundRequestError(Exception):
+    pass
+
+
+class HttpClient:
+    """
+    외부 API(네이버, 카카오) 호출용 공용 HTTP client 입니다.
+    host 별 keep-alive connection pool을 재사용하고, connect/read timeout을 적용하며,
+    연결 실패 또는 일시적인 오류 응답(502/503/504)은 jitter를 둔 지수 backoff로 제한된 횟수만큼 재시도합니다.
+    """
+    def __init__(self, connect_timeout=HTTP_CONNECT_TIMEOUT, read_timeout=HTTP_READ_TIMEOUT,
+                 retries=HTTP_RETRIES, backoff=HTTP_RETRY_BACKOFF, pool_size=HTTP_POOL_SIZE):
+        self.timeout = urllib3.Timeout(connect=connect_timeout, read=read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self._pool = None
+        self._pid = None
+        self._stats = defaultdict(lambda: {'requests': 0, 'errors': 0, 'total_ms': 0.0})
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self):
+        # gunicorn worker fork 이후 process 별로 connection pool 생성
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._pool = urllib3.PoolManager(maxsize=self.pool_size, timeout=self.timeout, retries=False)
+                    self._pid = os.getpid()
+        return self._pool
+
+    def request(self, method, url, headers=None, retries=None):
+        retries = self.retries if retries is None else retries
+        host = urlsplit(url).hostname
+
+        for attempt in range(retries + 1):
+            started = time.monotonic()
+            try:
+                response = self.pool.request(method, url, headers=headers)
+            except HTTPError as e:
+                self.record(host, started, error=True)
+                log.warning("outbound {} {} failed (attempt {}): {}", method, host, attempt + 1, e)
+                if attempt == retries:
+                    raise OutboundRequestError(str(e)) from e
+            else:
+                retryable = response.status in HTTP_RETRY_STATUSES
+                self.record(host, started, error=retryable)
+                if not retryable or attempt == retries:
+                    return response
+
+            time.sleep(self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+    def get(self, url, headers=None, **kwargs):
+        return self.request('GET', url, headers=headers, **kwargs)
+
+    def record(self, host, started, error=False):
+        elapsed = (time.monotonic() - started) * 1000
+        with self._lock:
+            stats = self._stats[host]
+            stats['requests'] += 1
+            stats['errors'] += int(error)
+            stats['total_ms'] += elapsed
+        log.info("outbound request: host={} latency={:.1f}ms error={}", host, elapsed, error)
+
+    def stats(self):
+        with self._lock:
+            return {host: dict(stats) for host, stats in self._stats.items()}
+
+
+http_client = HttpClient()
+
+
+class CircuitOpenError(OutboundRequestError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold 회에 도달하면 reset_timeout 동안 요청을 보내지 않고 바로 실패시킵니다(open).
+    reset_timeout이 지나면 요청 하나만 시험적으로 보내고(half-open), 성공하면 닫고 실패하면 다시 엽니다.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                log.info("circuit {} half-open, probing", self.name)
+                return
+            raise CircuitOpenError(f"circuit {self.name} is open")
+
+    def release(self):
+        # half-open 상태에서 요청을 보내지 않은 경우 다음 요청이 다시 probe 하도록 되돌림
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state, self.opened_at = self.OPEN, time.monotonic() - self.reset_timeout
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                log.info("circuit {} closed", self.name)
+            self.state, self.failures = self.CLOSED, 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    log.warning("circuit {} opened after {} failures", self.name, self.failures)
+                self.state, self.opened_at = self.OPEN, time.monotonic()
@@ -0,0 +1,154 @@
+import atexit
+import logging
+import os
+import socket
+import threading
+from collections import Counter
+
+from django.core.cache import caches
+
+from utils.cache import get_redis_client
+from utils.logging_utils import BraceStyleAdapter
+
+log = BraceStyleAdapter(logging.getLogger("utils.metrics"))
+
+METRICS_COUNTER_KEY = 'metrics:counters'
+METRICS_GAUGE_KEY = 'metrics:gauges:{}'
+METRICS_FLUSH_INTERVAL = 10
+# 종료된 worker의 gauge는 flush 주기의 3배가 지나면 만료
+METRICS_GAUGE_TIMEOUT = METRICS_FLUSH_INTERVAL * 3
+
+_pending = Counter()
+_totals = Counter()
+_gauges = {}
+_lock = threading.Lock()
+
+
+def get_worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def incr_metric(name, value=1):
+    # 요청 처리 중에는 process memory에만 누적하고, flusher thread가 주기적으로 redis에 반영
+    with _lock:
+        _pending[name] += value
+    start_metrics_flusher()
+
+
+def register_gauge(name, func):
+    # flush 시점에 func()의 값을 worker 별 gauge로 기록
+    with _lock:
+        _gauges[name] = func
+
+
+def sample_gauges():
+    with _lock:
+        gauges = dict(_gauges)
+    values = {}
+    for name, func in gauges.items():
+        try:
+            value = func()
+        except Exception as e:
+            log.warning("metric gauge {} failed: {}", name, e)
+            continue
+        if value is not None:
+            values[name] = value
+    return values
+
+
+def flush_metrics():
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+
+    client = get_redis_client()
+    if client is None:
+        with _lock:
+            _totals.update(pending)
+        return
+
+    cache = caches['default']
+    gauges = sample_gauges()
+    gauge_key = cache.make_key(METRICS_GAUGE_KEY.format(get_worker_id()))
+    try:
+        pipe = client.pipeline()
+        for name, value in pending.items():
+            pipe.hincrbyfloat(cache.make_key(METRICS_COUNTER_KEY), name, value)
+        if gauges:
+            pipe.hset(gauge_key, mapping=gauges)
+            pipe.expire(gauge_key, METRICS_GAUGE_TIMEOUT)
+        pipe.execute()
+    except Exception as e:
+        # 반영하지 못한 증가분은 다음 flush에서 다시 시도
+        log.warning("metrics flush failed: {}", e)
+        with _lock:
+            _pending.update(pending)
+
+
+def get_metrics():
+    """
+    모든 worker의 누적 counter와 worker 별 gauge를 return 합니다.
+    redis가 없는 경우(dev: LocMemCache) 현재 process의 값만 return 합니다.
+    """
+    flush_metrics()
+    client = get_redis_client()
+    if client is None:
+        with _lock:
+            counters = dict(_totals)
+        return {'counters': counters, 'gauges': {get_worker_id(): sample_gauges()}}
+
+    cache = caches['default']
+    counters = {
+        name.decode('utf-8'): float(value)
+        for name, value in client.hgetall(cache.make_key(METRICS_COUNTER_KEY)).items()
+    }
+    prefix = cache.make_key(METRICS_GAUGE_KEY.format(''))
+    gauges = {}
+    for key in client.scan_iter(match=prefix + '*', count=100):
+        values = client.hgetall(key)
+        if values:
+            gauges[key.decode('utf-8')[len(prefix):]] = {
+                name.decode('utf-8'): float(value) for name, value in values.items()
+            }
+    return {'counters': counters, 'gauges': gauges}
+
+
+class MetricsFlusher(threading.Thread):
+    def __init__(self, interval=METRICS_FLUSH_INTERVAL):
+        super().__init__(name='metrics-flusher', daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        try:
+            flush_metrics()
+        except Exception as e:
+            log.warning("metrics flush failed: {}", e)
+
+    def stop(self):
+        self.stopped.set()
+        self.flush()
+
+
+_flusher = None
+_flusher_pid = None
+_flusher_lock = threading.Lock()
+
+
+def start_metrics_flusher():
+    # gunicorn worker fork 이후 process 별로 한 번만 시작
+    global _flusher, _flusher_pid
+    if _flusher_pid == os.getpid():
+        return _flusher
+
+    with _flusher_lock:
+        if _flusher_pid != os.getpid():
+            _flusher = MetricsFlusher()
+            _flusher.start()
+            _flusher_pid = os.getpid()
+            atexit.register(_flusher.stop)
+    return _flusher
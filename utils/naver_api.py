@@ -1,11 +1,209 @@
+import hashlib
 import re
 import json
+import os
+import threading
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Union, Tuple
-from urllib import request, parse
+from urllib import parse
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
 
-from rest_framework.exceptions import ValidationError
 from core.validators import ISBNValidator
 from scribble.settings.base import NAVER_API_CLIENT_ID, NAVER_API_CLIENT_SECRET
+from utils.cache import LRUCache, consume_quota, get_redis_client
+from utils.http import CircuitBreaker, CircuitOpenError, OutboundRequestError, http_client
+from utils.logging_utils import BraceStyleAdapter
+from utils.metrics import incr_metric, register_gauge
+
+log = BraceStyleAdapter(logging.getLogger("utils.naver_api"))
+
+NAVER_SEARCH_CACHE_KEY = 'naver:search:{}'
+
+
+class NaverSearchCache:
+    """
+    네이버 도서 검색 결과를 process 내 LRU와 cache(redis)에 저장합니다.
+    redis에 저장된 결과는 worker 재시작 후에도 유지되며, 조회 시 local LRU에도 채워집니다.
+    hit/miss 수는 모든 worker가 공유하는 metric(utils.metrics)으로도 기록합니다.
+    """
+    def __init__(self):
+        self.local = None
+        self.remote_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def options(self):
+        return settings.NAVER_SEARCH_CACHE
+
+    def get_local(self):
+        if self.local is None:
+            self.local = LRUCache(maxsize=self.options["LOCAL_CACHE_SIZE"])
+        return self.local
+
+    @staticmethod
+    def make_key(param, display):
+        # 공백/대소문자만 다른 검색어는 같은 key를 사용
+        normalized = ' '.join(param.split()).lower()
+        digest = hashlib.sha1(f'{display}:{normalized}'.encode('utf-8')).hexdigest()
+        return NAVER_SEARCH_CACHE_KEY.format(digest)
+
+    def get_timeout(self, result):
+        search_type, items = result
+        if not items:
+            return self.options["EMPTY_TIMEOUT"]
+        if search_type == 'isbn':
+            return self.options["ISBN_TIMEOUT"]
+        return self.options["QUERY_TIMEOUT"]
+
+    def get(self, key):
+        now = time.time()
+        result = self.get_local().get(key, now=now)
+        if result is not None:
+            incr_metric('naver_search_cache.local_hits')
+            return result
+
+        cached = caches['default'].get(key)
+        with self._lock:
+            if cached is None or cached[1] <= now:
+                self.misses += 1
+                incr_metric('naver_search_cache.misses')
+                return None
+            self.remote_hits += 1
+        incr_metric('naver_search_cache.remote_hits')
+
+        result, expires_at = cached
+        self.get_local().set(key, result, expires_at=expires_at)
+        return result
+
+    def get_stale(self, key):
+        # 네이버 API 장애 시 만료된 결과라도 사용
+        cached = caches['default'].get(key)
+        return None if cached is None else cached[0]
+
+    def set(self, key, result):
+        timeout = self.get_timeout(result)
+        expires_at = time.time() + timeout
+        caches['default'].set(key, (result, expires_at), timeout + self.options["STALE_TIMEOUT"])
+        self.get_local().set(key, result, expires_at=expires_at)
+
+    def stats(self):
+        local = self.get_local().stats()
+        with self._lock:
+            return {
+                'local_size': local['size'],
+                'local_hits': local['hits'],
+                'remote_hits': self.remote_hits,
+                'misses': self.misses,
+            }
+
+
+search_cache = NaverSearchCache()
+register_gauge('naver_search_cache.local_size', lambda: search_cache.stats()['local_size'])
+
+NAVER_SEARCH_WORKERS = 8
+_search_executor = None
+_search_executor_pid = None
+_search_executor_lock = threading.Lock()
+
+
+def get_search_executor():
+    # gunicorn worker fork 이후 process 별로 생성
+    global _search_executor, _search_executor_pid
+    with _search_executor_lock:
+        if _search_executor_pid != os.getpid():
+            _search_executor = ThreadPoolExecutor(max_workers=NAVER_SEARCH_WORKERS, thread_name_prefix='naver-search')
+            _search_executor_pid = os.getpid()
+    return _search_executor
+
+
+NAVER_QUOTA_BUCKET_KEY = 'naver:quota:bucket'
+NAVER_QUOTA_DAILY_KEY = 'naver:quota:daily:{}'
+NAVER_QUOTA_TIMEZONE = ZoneInfo('Asia/Seoul')
+
+
+class NaverQuotaGovernor:
+    """
+    모든 worker가 공유하는 redis token bucket(초당)과 일일 호출 수로 네이버 API 호출량을 제한합니다.
+    interactive(검색 화면) 호출이 우선이며, background(도서 정보 보강) 호출은 일부 quota를 남겨두고 사용합니다.
+    """
+    INTERACTIVE, BACKGROUND = 'interactive', 'background'
+
+    def __init__(self):
+        self.tokens = None
+        self.daily_remaining = None
+        self.denied = {self.INTERACTIVE: 0, self.BACKGROUND: 0}
+        self._lock = threading.Lock()
+
+    @property
+    def options(self):
+        return settings.NAVER_API_QUOTA
+
+    def acquire(self, priority=INTERACTIVE):
+        client = get_redis_client()
+        if client is None:
+            incr_metric(f'naver_quota.allowed.{priority}')
+            return True
+
+        options = self.options
+        reserve = options["BACKGROUND_RESERVE"] if priority == self.BACKGROUND else 0
+        # 네이버 일일 quota는 한국 시간 자정에 초기화
+        daily_key = NAVER_QUOTA_DAILY_KEY.format(datetime.now(NAVER_QUOTA_TIMEZONE).strftime('%Y%m%d'))
+        deadline = time.monotonic() + options["MAX_WAIT"][priority]
+
+        while True:
+            allowed, wait, tokens, daily_remaining = consume_quota(
+                client, NAVER_QUOTA_BUCKET_KEY, daily_key,
+                capacity=options["PER_SECOND"],
+                rate=options["PER_SECOND"],
+                daily_limit=options["DAILY"],
+                reserve_tokens=options["PER_SECOND"] * reserve,
+                reserve_daily=int(options["DAILY"] * reserve)
+            )
+            with self._lock:
+                self.tokens, self.daily_remaining = tokens, daily_remaining
+            if allowed:
+                incr_metric(f'naver_quota.allowed.{priority}')
+                return True
+            if wait < 0 or time.monotonic() + wait > deadline:
+                break
+            time.sleep(wait)
+
+        with self._lock:
+            self.denied[priority] += 1
+        incr_metric(f'naver_quota.denied.{priority}')
+        log.warning("naver api quota denied: priority={} daily_remaining={}", priority, daily_remaining)
+        return False
+
+    def stats(self):
+        with self._lock:
+            return {'tokens': self.tokens, 'daily_remaining': self.daily_remaining, 'denied': dict(self.denied)}
+
+
+naver_quota = NaverQuotaGovernor()
+# 마지막으로 확인한 redis bucket의 남은 token / 남은 일일 호출 수 (redis가 없는 경우 기록하지 않음)
+register_gauge('naver_quota.tokens', lambda: naver_quota.stats()['tokens'])
+register_gauge('naver_quota.daily_remaining', lambda: naver_quota.stats()['daily_remaining'])
+
+
+class SearchUnavailable(APIException):
+    # ValidationError를 상속하지 않으므로 isbn 검증 실패 시의 제목 검색으로 넘어가지 않음
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("book_search_unavailable")
+    default_code = 'service_unavailable'
+
+
+naver_circuit = CircuitBreaker('naver')
 
 
 class NaverSearchAPI:
@@ -13,16 +211,65 @@ class NaverSearchAPI:
     isbn_url = "https://openapi.naver.com/v1/search/book_adv?sort=sim&d_isbn="
     title_url = "https://openapi.naver.com/v1/search/book_adv?sort=sim&d_titl="
     query_url = "https://openapi.naver.com/v1/search/book.json?query="
+    cache = search_cache
+    concurrent_fallback = False
+    # concurrent_fallback 사용 시 제목 검색 결과를 기다린 뒤 재검색 요청을 함께 보내기까지의 시간(초)
+    fallback_delay = 0.2
+    priority = NaverQuotaGovernor.INTERACTIVE
+
+    def __init__(self, concurrent_fallback=None, priority=None):
+        if concurrent_fallback is not None:
+            self.concurrent_fallback = concurrent_fallback
+        if priority is not None:
+            self.priority = priority
 
     def __call__(self, param, display=None):
-        self.display = display or self.default_display
-        items, search_type = self.search(param)
-        return search_type, self.resp(items)
+        result = self.search_with_status(param, display)
+        return None if result is None else result[:2]
+
+    def search_with_status(self, param, display=None):
+        """
+        (search_type, 검색 결과, degraded)를 return 합니다.
+        네이버 API를 사용할 수 없는 경우 만료된 cache 결과 또는 등록된 도서 중 일치하는 결과를 degraded=True로 return 합니다.
+        """
+        # 여러 request thread가 같은 instance를 공유하므로 요청별 값은 instance에 저장하지 않음
+        display = display or self.default_display
+        if bool(not param or param.isspace()):
+            return None
+
+        key = self.cache.make_key(param, display)
+        result = self.cache.get(key)
+        if result is not None:
+            return (*result, False)
+
+        try:
+            items, search_type = self.search(param, display)
+        except SearchUnavailable:
+            return (*self.fallback(key, param, display), True)
+
+        result = search_type, self.resp(items)
+        self.cache.set(key, result)
+        return (*result, False)
+
+    def fallback(self, key, param, display):
+        stale = self.cache.get_stale(key)
+        if stale is not None:
+            return stale
+
+        from apps.contents.models import BookObject
+
+        books = BookObject.objects.filter(
+            Q(title__contains=param) |
+            Q(author__contains=param) |
+            Q(publisher__contains=param) |
+            Q(isbn__exact=param)
+        ).values('isbn', 'title', 'author', 'publisher', 'thumbnail')
+        return 'local', list(books[:int(display)])
 
     @staticmethod
     def resp(items):
         result = []
-        for i, item in enumerate(items):
+        for i, item in enumerate(items or []):
             isbn = re.sub('<.+?>', '', item["isbn"]).rsplit(" ", 1)
             result.append({
                 "isbn": isbn[1] if len(isbn) > 1 else isbn[0],
@@ -34,39 +281,92 @@ class NaverSearchAPI:
 
         return result
 
-    @staticmethod
-    def send_request(req_url) -> Union[dict, None]:
-        req = request.Request(url=req_url)
-        req.add_header("X-Naver-Client-Id", NAVER_API_CLIENT_ID)
-        req.add_header("X-Naver-Client-Secret", NAVER_API_CLIENT_SECRET)
+    def send_request(self, req_url) -> Union[dict, None]:
+        headers = {
+            "X-Naver-Client-Id": NAVER_API_CLIENT_ID,
+            "X-Naver-Client-Secret": NAVER_API_CLIENT_SECRET
+        }
+        try:
+            naver_circuit.before_call()
+        except CircuitOpenError:
+            raise SearchUnavailable()
 
-        response = request.urlopen(req)
+        if not naver_quota.acquire(self.priority):
+            naver_circuit.release()
+            raise SearchUnavailable()
+
+        try:
+            response = http_client.get(req_url, headers=headers)
+        except OutboundRequestError:
+            naver_circuit.record_failure()
+            raise SearchUnavailable()
 
-        res_code = response.getcode()
-        if res_code != 200:
+        # 요청 제한(429), 서버 오류만 장애로 판단
+        if response.status == 429 or response.status >= 500:
+            naver_circuit.record_failure()
+            raise SearchUnavailable()
+        naver_circuit.record_success()
+        if response.status != 200:
             raise ValidationError("invalid_response")
 
-        res_body = response.read().decode('utf-8')
-        data = json.loads(res_body)
+        data = json.loads(response.data.decode('utf-8'))
         return data['items'] if 'items' in data else None
 
-    def search(self, param: str) -> Union[Tuple[dict, str], None]:
+    def search(self, param: str, display=None) -> Union[Tuple[dict, str], None]:
         if bool(not param or param.isspace()):
             return None
         try:
             ISBNValidator(param)
-            url = self.isbn_url + parse.quote('{}'.format(param))
-            resp = self.send_request(req_url=url)
-            if len(resp) > 1:
-                raise ValidationError("invalid_result")
-            return resp, 'isbn'
         except ValidationError:
-            param = parse.quote(param)
-            # 도서 제목으로 우선검색. 결과가 적거나 없는 경우 query paramter로 재검색 수행
-            url = self.title_url + param + "&display=" + str(self.display)
-            resp = self.send_request(req_url=url)
-            if len(resp) > 5:
-                return resp, 'title'
-            url = self.query_url + param + "&display=" + str(self.display)
+            is_isbn = False
+        else:
+            is_isbn = True
+
+        if is_isbn:
+            url = self.isbn_url + parse.quote('{}'.format(param))
             resp = self.send_request(req_url=url)
-            return resp, 'author_pubilsher'
+            # isbn 검색 결과가 여러 개인 경우 제목 검색 수행
+            if len(resp) <= 1:
+                return resp, 'isbn'
+
+        param = parse.quote(param)
+        # 도서 제목으로 우선검색. 결과가 적거나 없는 경우 query paramter로 재검색 수행
+        display = display or self.default_display
+        title_url = self.title_url + param + "&display=" + str(display)
+        query_url = self.query_url + param + "&display=" + str(display)
+        if self.concurrent_fallback:
+            return self.search_concurrently(title_url, query_url)
+
+        resp = self.send_request(req_url=title_url)
+        if len(resp) > 5:
+            return resp, 'title'
+        resp = self.send_request(req_url=query_url)
+        return resp, 'author_pubilsher'
+
+    def search_concurrently(self, title_url, query_url):
+        """
+        제목 검색이 fallback_delay 안에 끝나지 않으면 재검색 요청을 함께 보냅니다.
+        제목 검색 결과가 충분하면(또는 실패하면) 아직 보내지 않은 재검색 요청은 quota를 사용하지 않고 건너뜁니다.
+        """
+        title_done, title_state = threading.Event(), {'skip_query': False}
+
+        def send_query():
+            title_done.wait(self.fallback_delay)
+            if title_state['skip_query']:
+                return None
+            return self.send_request(req_url=query_url)
+
+        query_future = get_search_executor().submit(send_query)
+        try:
+            resp = self.send_request(req_url=title_url)
+            title_state['skip_query'] = len(resp) > 5
+        except Exception:
+            title_state['skip_query'] = True
+            raise
+        finally:
+            title_done.set()
+
+        if title_state['skip_query']:
+            query_future.cancel()
+            return resp, 'title'
+        return query_future.result(), 'author_pubilsher'
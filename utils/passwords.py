@@ -0,0 +1,83 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from core.exceptions import PasswordHashingOverloaded
+from utils.logging_utils import BraceStyleAdapter
+from utils.metrics import incr_metric, register_gauge
+
+log = BraceStyleAdapter(logging.getLogger("scribble.passwords"))
+
+# 실행 중 + 대기 중인 hashing 작업이 request thread 수보다 적도록 제한 (최소 1개 thread는 다른 API 처리용)
+PASSWORD_HASHING_CAPACITY = max(1, settings.GUNICORN_THREADS - 1)
+PASSWORD_HASHING_WORKERS = min(2, PASSWORD_HASHING_CAPACITY)
+PASSWORD_HASHING_QUEUE_SIZE = PASSWORD_HASHING_CAPACITY - PASSWORD_HASHING_WORKERS
+
+
+class PasswordHashingPool:
+    """
+    password hashing(check_password, set_password)을 크기가 제한된 전용 thread pool에서 실행합니다.
+    실행 중 + 대기 중인 작업이 max_workers + queue_size를 넘으면 기다리지 않고 503(Retry-After)을 return 합니다.
+    기본 크기는 request thread 수보다 작으므로, 로그인이 몰려도 다른 API를 처리할 thread가 남습니다.
+    """
+    def __init__(self, max_workers=PASSWORD_HASHING_WORKERS, queue_size=PASSWORD_HASHING_QUEUE_SIZE):
+        self.max_workers = max_workers
+        self.capacity = max_workers + queue_size
+        self.rejected = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _get_executor(self):
+        # gunicorn worker fork 이후 process 별로 생성
+        if self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='password-hashing')
+            self._pid = os.getpid()
+        return self._executor
+
+    def run(self, func, *args, **kwargs):
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                log.warning("password hashing rejected: queue_depth={} rejected={}", self._in_flight, self.rejected)
+                incr_metric('password_hashing.rejected')
+                raise PasswordHashingOverloaded()
+            self._in_flight += 1
+            queue_depth = self._in_flight
+            executor = self._get_executor()
+
+        submitted_at = time.monotonic()
+        try:
+            future = executor.submit(self._timed, func, args, kwargs, submitted_at, queue_depth)
+            return future.result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    @staticmethod
+    def _timed(func, args, kwargs, submitted_at, queue_depth):
+        started_at = time.monotonic()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            finished_at = time.monotonic()
+            incr_metric('password_hashing.count')
+            incr_metric('password_hashing.wait_ms', (started_at - submitted_at) * 1000)
+            incr_metric('password_hashing.run_ms', (finished_at - started_at) * 1000)
+            log.info(
+                "password hashing: wait={:.1f}ms run={:.1f}ms queue_depth={}",
+                (started_at - submitted_at) * 1000, (finished_at - started_at) * 1000, queue_depth
+            )
+
+    def stats(self):
+        with self._lock:
+            return {'queue_depth': self._in_flight, 'rejected': self.rejected}
+
+
+password_hashing_pool = PasswordHashingPool()
+register_gauge('password_hashing.queue_depth', lambda: password_hashing_pool.stats()['queue_depth'])
@@ -1,4 +1,6 @@
 import json
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
 from rest_framework import renderers
 from rest_framework.status import is_success, is_client_error, is_server_error
 
@@ -27,3 +29,23 @@ class ResponseRenderer(renderers.JSONRenderer):
                     response_json[data_key] = data
 
         return json.dumps(response_json, default=str)
+
+
+def stream_success_response(rows, chunk_size=500):
+    """
+    rows(dict iterator)를 ResponseRenderer의 성공 응답과 동일한 형식({"status": "success", "data": [...]})으로
+    chunk_size 단위로 나누어 전송합니다. 전체 결과를 메모리에 올리지 않으며, datetime은 DjangoJSONEncoder로 바로 encoding 합니다.
+    """
+    def stream():
+        encoder = DjangoJSONEncoder()
+        chunk, first = ['{"status": "success", "data": ['], True
+        for row in rows:
+            chunk.append(encoder.encode(row) if first else ', ' + encoder.encode(row))
+            first = False
+            if len(chunk) >= chunk_size:
+                yield ''.join(chunk)
+                chunk = []
+        chunk.append(']}')
+        yield ''.join(chunk)
+
+    return StreamingHttpResponse(stream(), content_type='application/json')
@@ -213,8 +213,8 @@ page_response_example = {
             "content": "test2",
             "page_id": 131
         }
-    ]
-
+    ],
+    'page_comments_cursor': None
 }
 
 page_comment_response_example = {
@@ -231,6 +231,25 @@ page_comment_response_example = {
     }
 }
 
+page_comment_list_response_example = {
+    'previous_cursor': None,
+    'next_cursor': 'eyJvIjogWyJjcmVhdGVkX2F0IiwgImlkIl0sICJwIjogWyIyMDIyLTA2LTAxVDAzOjQyOjMxLjQwNDc4OSswMDowMCIsIDJdLCAiciI6IGZhbHNlfQ==',
+    'page_comments': [
+        page_comment_response_example['page_comment'],
+        {
+            'id': 2,
+            "comment_user": {
+                'id': 2,
+                'nickname': 'nickname2'
+            },
+            'depth': 1,
+            'parent': page_comment_response_example['page_comment'],
+            'content': 'reply',
+            'page_id': 1
+        }
+    ]
+}
+
 main_response_example = {
     'count': 20,
     'previous_offset': 0,
@@ -241,6 +260,9 @@ main_response_example = {
 }
 
 user_main_response_example = {
+    "count": 4,
+    "previous_offset": None,
+    "next_offset": None,
     "notes": [
         {
             "id": 1,